@@ -1,6 +1,10 @@
 """Example mission using the a detailed battery model."""
 
-from aviary.api import default_height_energy_phase_info as phase_info
+from copy import deepcopy
+
+import numpy as np
+
+from aviary.api import default_height_energy_phase_info
 # from aviary.examples.external_subsystems.battery.battery_builder import BatteryBuilder
 from aviary.subsystems.energy.battery_builder import BatteryBuilder
 from aviary.examples.external_subsystems.battery.battery_variable_meta_data import ExtendedMetaData
@@ -9,15 +13,17 @@ from aviary.utils.functions import get_aviary_resource_path
 from aviary.variable_info.variables import Aircraft, Mission
 from aviary.examples.external_subsystems.battery.battery_variables import Dynamic
 
-battery_builder = BatteryBuilder()
+# copy so that importing this example does not modify the shared default phase_info
+phase_info = deepcopy(default_height_energy_phase_info)
 
-# add the battery model to each mission phase, as well as pre-mission for sizing
-phase_info['pre_mission']['external_subsystems'] = [battery_builder]
-phase_info['climb']['external_subsystems'] = [battery_builder]
-phase_info['cruise']['external_subsystems'] = [battery_builder]
-phase_info['descent']['external_subsystems'] = [battery_builder]
 
 if __name__ == '__main__':
+    battery_builder = BatteryBuilder()
+
+    # add the battery model to each mission phase, as well as pre-mission for sizing
+    for phase in ('pre_mission', 'climb', 'cruise', 'descent'):
+        phase_info[phase]['external_subsystems'] = [battery_builder]
+
     prob = AviaryProblem()
 
     # Load aircraft and options data from user
@@ -42,7 +48,7 @@ if __name__ == '__main__':
     prob.setup()
 
     prob.run_aviary_problem()
-    import numpy as np
+
     # print(np.round(prob.get_val('aircraft:battery:energy_required'), 2))
     print(np.round(prob.get_val(Aircraft.Battery.MASS), 2))
     print(np.round(prob.get_val(Mission.Summary.GROSS_MASS), 2))
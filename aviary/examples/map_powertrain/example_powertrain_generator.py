@@ -14,11 +14,16 @@ Author: PowertrainMapper with component_matices
 Date: 2025-10-08
 """
 
-import numpy as np
-from dataclasses import dataclass
-from typing import Dict
+import math
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
 from aviary.utils.powertrain_utils.powertrain_mapping import PowertrainMapper, PowertrainConfig
-from aviary.utils.powertrain_utils.component_matices import power_transmission_computation
+from aviary.utils.powertrain_utils.component_matices import (
+    _CONFIG_TABLE,
+    power_transmission_computation,
+)
 
 
 # Global configuration for the serial hybrid powertrain
@@ -36,10 +41,28 @@ SERIAL_HYBRID_CONFIG = PowertrainConfig(
     P_inst=1.65e6*6  # 1.65 MW
 )
 
+# Unit conversions
+FT_TO_M = 0.3048
+N_TO_LBF = 0.224809
+
+# Fuel flow = GT power / (thermal efficiency * fuel energy content)
+# Thermal efficiency of ~30% for gas turbines
+# Energy content of jet fuel: ~18,500 Btu/lb
+THERMAL_EFFICIENCY = 0.30
+FUEL_ENERGY_CONTENT_WH_PER_LB = 18500.0 * 1055.06 / 3600.0  # Btu/lb to Wh/lb
+_FUEL_FLOW_DIVISOR_W_PER_LB_H = THERMAL_EFFICIENCY * FUEL_ENERGY_CONTENT_WH_PER_LB
 
+# NOx emissions index: typical value is 15 g NOx / kg fuel = 0.015 lb NOx / lb fuel
+NOX_EMISSIONS_INDEX = 0.015
+
+
+@lru_cache(maxsize=None)
 def calculate_speed_of_sound(altitude_ft: float) -> float:
     """
     Calculate speed of sound using standard atmosphere model.
+
+    Results are cached per altitude, since a mapping grid only contains a handful of
+    distinct altitudes.
     
     Parameters
     ----------
@@ -52,7 +75,7 @@ def calculate_speed_of_sound(altitude_ft: float) -> float:
         Speed of sound in m/s
     """
     # Convert altitude to meters
-    altitude_m = altitude_ft * 0.3048
+    altitude_m = altitude_ft * FT_TO_M
     
     # Standard atmosphere model (simplified)
     if altitude_m <= 11000:  # Troposphere
@@ -62,11 +85,49 @@ def calculate_speed_of_sound(altitude_ft: float) -> float:
     
     # Speed of sound: a = sqrt(gamma * R * T)
     # gamma = 1.4 for air, R = 287.05 J/(kg·K)
-    speed_of_sound = np.sqrt(1.4 * 287.05 * T)
+    # math.sqrt avoids the NumPy ufunc dispatch on what is always a Python float here
+    speed_of_sound = math.sqrt(1.4 * 287.05 * T)
     
     return speed_of_sound
 
 
+@lru_cache(maxsize=None)
+def _honors_supplied_power_ratio(config_name: str) -> bool:
+    """
+    Return True if the configuration takes the supplied power ratio and the throttle as
+    its only operating conditions.
+    """
+    spec = _CONFIG_TABLE.get(config_name.lower())
+    return spec is not None and spec.supplied_power_ratio is None and spec.DOFs == 2
+
+
+@lru_cache(maxsize=4096)
+def _solve_power(
+    config: PowertrainConfig,
+    supplied_power_ratio: float,
+    throttle_setting: float
+) -> Mapping[str, float]:
+    """
+    Return the memoized power flow (P_out) from power_transmission_computation.
+
+    The power flow does not depend on Mach or altitude, so every grid point sharing a
+    (supplied_power_ratio, throttle_setting) pair reuses a single solve. The cached
+    P_out is shared between callers, so it is returned as a read-only mapping.
+    """
+    P_out, *_ = power_transmission_computation(
+        config=config.config,
+        etas=config.etas,
+        supplied_power_ratio=supplied_power_ratio,
+        shaft_power_ratio=math.nan,  # For serial, this is set internally to 1.0
+        throttle_setting=throttle_setting,
+        P_p=math.nan,
+        P_p1=math.nan,
+        P_p2=math.nan,
+        P_inst=config.P_inst
+    )
+    return MappingProxyType(P_out)
+
+
 def calculate_thrust_from_powertrain(
     mach: float, 
     altitude_ft: float, 
@@ -98,18 +159,8 @@ def calculate_thrust_from_powertrain(
     # Normalize throttle to 0-1
     throttle_setting = throttle / 100.0
     
-    # Call power_transmission_computation
-    P_out, xi_out, phi_out, Phi_out, solution, throttle_config = power_transmission_computation(
-        config=config.config,
-        etas=config.etas,
-        supplied_power_ratio=supplied_power_ratio,
-        shaft_power_ratio=np.nan,  # For serial, this is set internally to 1.0
-        throttle_setting=throttle_setting,
-        P_p=np.nan,
-        P_p1=np.nan,
-        P_p2=np.nan,
-        P_inst=config.P_inst
-    )
+    # Call power_transmission_computation (memoized on supplied_power_ratio/throttle)
+    P_out = _solve_power(config, supplied_power_ratio, throttle_setting)
     
     # Calculate flight speed: V = M * a (speed of sound)
     speed_of_sound_ms = calculate_speed_of_sound(altitude_ft)
@@ -122,7 +173,7 @@ def calculate_thrust_from_powertrain(
     # Propulsive power to thrust: Thrust = P_propulsive / V
     # P_out['p'] is in Watts, flight_speed is in m/s
     thrust_N = P_out['p'] / flight_speed_ms
-    thrust_lbf = thrust_N * 0.224809  # N to lbf
+    thrust_lbf = thrust_N * N_TO_LBF
     
     return thrust_lbf
 
@@ -156,7 +207,7 @@ def calculate_ram_drag(
         Ram drag in lbf
     """
     # Ram drag scales with Mach squared
-    mach_factor = mach**2
+    mach_factor = mach * mach
     
     # Altitude effects: lower air density reduces ram drag
     altitude_factor = (1.0 - altitude_ft / 100000.0)
@@ -195,34 +246,26 @@ def calculate_fuel_flow_from_powertrain(
     float
         Fuel flow in lb/h
     """
+    # With all power supplied by the battery no fuel is burned (P_f = P_gt = 0), so the
+    # power flow does not need to be solved. This only holds for configurations that
+    # honor supplied_power_ratio and are fully specified by it and the throttle, as in
+    # _solve_power; any other configuration goes through the solve like the thrust and
+    # electric power functions do.
+    if supplied_power_ratio >= 1.0 and _honors_supplied_power_ratio(config.config):
+        return 0.0
+
     throttle_setting = throttle / 100.0
     
-    # Call power_transmission_computation
-    P_out, xi_out, phi_out, Phi_out, solution, throttle_config = power_transmission_computation(
-        config=config.config,
-        etas=config.etas,
-        supplied_power_ratio=supplied_power_ratio,
-        shaft_power_ratio=np.nan,
-        throttle_setting=throttle_setting,
-        P_p=np.nan,
-        P_p1=np.nan,
-        P_p2=np.nan,
-        P_inst=config.P_inst
-    )
+    # Call power_transmission_computation (memoized on supplied_power_ratio/throttle)
+    P_out = _solve_power(config, supplied_power_ratio, throttle_setting)
     
     # GT power is P_out['gt'] in Watts
     # Convert to fuel flow using thermal efficiency
-    # Thermal efficiency of ~30% for gas turbines
-    # Energy content of jet fuel: ~18,500 Btu/lb
-    
     P_gt_W = P_out['gt']
     
-    thermal_efficiency = 0.30
-    fuel_energy_content_Wh_per_lb = 18500.0 * 1055.06 / 3600.0  # Btu/lb to Wh/lb
-    
     # Fuel flow = Power / (efficiency * energy_content)
     if P_gt_W > 0:
-        fuel_flow_lb_h = P_gt_W / (thermal_efficiency * fuel_energy_content_Wh_per_lb)
+        fuel_flow_lb_h = P_gt_W / _FUEL_FLOW_DIVISOR_W_PER_LB_H
     else:
         fuel_flow_lb_h = 0.0
     
@@ -260,10 +303,7 @@ def calculate_nox_rate_from_fuel_flow(
     # Get fuel flow
     fuel_flow = calculate_fuel_flow_from_powertrain(mach, altitude_ft, throttle, supplied_power_ratio, config)
     
-    # NOx emissions index: typical value is 15 g NOx / kg fuel = 0.015 lb NOx / lb fuel
-    nox_emissions_index = 0.015
-    
-    nox_rate = fuel_flow * nox_emissions_index
+    nox_rate = fuel_flow * NOX_EMISSIONS_INDEX
     
     return nox_rate
 
@@ -298,18 +338,8 @@ def calculate_electric_power_from_powertrain(
     """
     throttle_setting = throttle / 100.0
     
-    # Call power_transmission_computation
-    P_out, xi_out, phi_out, Phi_out, solution, throttle_config = power_transmission_computation(
-        config=config.config,
-        etas=config.etas,
-        supplied_power_ratio=supplied_power_ratio,
-        shaft_power_ratio=np.nan,
-        throttle_setting=throttle_setting,
-        P_p=np.nan,
-        P_p1=np.nan,
-        P_p2=np.nan,
-        P_inst=config.P_inst
-    )
+    # Call power_transmission_computation (memoized on supplied_power_ratio/throttle)
+    P_out = _solve_power(config, supplied_power_ratio, throttle_setting)
     
     # Battery power is P_out['bat'] in Watts
     # Convert to kW
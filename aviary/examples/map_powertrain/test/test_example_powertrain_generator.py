@@ -0,0 +1,78 @@
+import math
+import unittest
+
+from openmdao.utils.assert_utils import assert_near_equal
+
+from aviary.examples.map_powertrain.example_powertrain_generator import (
+    _FUEL_FLOW_DIVISOR_W_PER_LB_H,
+    SERIAL_HYBRID_CONFIG,
+    _solve_power,
+    calculate_electric_power_from_powertrain,
+    calculate_fuel_flow_from_powertrain,
+    calculate_thrust_from_powertrain,
+)
+from aviary.utils.powertrain_utils.component_matices import power_transmission_computation
+from aviary.utils.powertrain_utils.powertrain_mapping import PowertrainConfig
+
+
+class TestPureElectricFuelFlow(unittest.TestCase):
+    """Check the pure-electric fuel flow shortcut against the full power-flow solve."""
+
+    def test_shortcut_matches_solve(self):
+        for name in ('serial', 'Serial', 'parallel', 'PARALLEL'):
+            config = PowertrainConfig(
+                config=name, etas=SERIAL_HYBRID_CONFIG.etas, P_inst=SERIAL_HYBRID_CONFIG.P_inst
+            )
+
+            for throttle in (0.0, 30.0, 100.0):
+                with self.subTest(config=name, throttle=throttle):
+                    P_out, *_ = power_transmission_computation(
+                        config=name,
+                        etas=config.etas,
+                        supplied_power_ratio=1.0,
+                        shaft_power_ratio=math.nan,
+                        throttle_setting=throttle / 100.0,
+                        P_p=math.nan,
+                        P_p1=math.nan,
+                        P_p2=math.nan,
+                        P_inst=config.P_inst,
+                    )
+                    expected = max(P_out['gt'], 0.0) / _FUEL_FLOW_DIVISOR_W_PER_LB_H
+
+                    fuel_flow = calculate_fuel_flow_from_powertrain(
+                        0.5, 10000.0, throttle, 1.0, config=config
+                    )
+
+                    assert_near_equal(fuel_flow, expected, tolerance=1e-12)
+                    self.assertEqual(fuel_flow, 0.0)
+
+    def test_spph_is_not_shortcut(self):
+        # SPPH needs a shaft power ratio as well, which the generator does not supply, so
+        # the fuel flow fails the same way as the thrust and electric power
+        config = PowertrainConfig(
+            config='spph', etas=SERIAL_HYBRID_CONFIG.etas, P_inst=SERIAL_HYBRID_CONFIG.P_inst
+        )
+
+        for function in (
+            calculate_thrust_from_powertrain,
+            calculate_fuel_flow_from_powertrain,
+            calculate_electric_power_from_powertrain,
+        ):
+            with self.subTest(function=function.__name__):
+                with self.assertRaises(ValueError):
+                    function(0.5, 10000.0, 30.0, 1.0, config=config)
+
+class TestSolvePowerCache(unittest.TestCase):
+    """Check that the memoized power flow cannot be modified by a caller."""
+
+    def test_cached_power_flow_is_read_only(self):
+        P_out = _solve_power(SERIAL_HYBRID_CONFIG, 0.5, 0.3)
+
+        with self.assertRaises(TypeError):
+            P_out['p'] = 0.0
+
+        self.assertIs(_solve_power(SERIAL_HYBRID_CONFIG, 0.5, 0.3), P_out)
+
+
+if __name__ == '__main__':
+    unittest.main()
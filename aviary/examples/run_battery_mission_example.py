@@ -1,6 +1,9 @@
 """Example mission using the a detailed battery model."""
 
-from aviary.api import default_height_energy_phase_info as phase_info
+import importlib.util
+
+import numpy as np
+
 from aviary.subsystems.energy.battery_builder import BatteryBuilder
 from aviary.interface.methods_for_level2 import AviaryProblem
 from aviary.utils.functions import get_aviary_resource_path
@@ -75,16 +78,14 @@ phase_info = {
     },
 }
 
-battery_builder = BatteryBuilder()
 
-# add the battery model to each mission phase, as well as pre-mission for sizing
-phase_info['pre_mission']['external_subsystems'] = [battery_builder]
-phase_info['climb']['external_subsystems'] = [battery_builder]
-phase_info['cruise']['external_subsystems'] = [battery_builder]
-phase_info['descent']['external_subsystems'] = [battery_builder]
+if __name__ == '__main__':
+    battery_builder = BatteryBuilder()
 
+    # add the battery model to each mission phase, as well as pre-mission for sizing
+    for phase in ('pre_mission', 'climb', 'cruise', 'descent'):
+        phase_info[phase]['external_subsystems'] = [battery_builder]
 
-if __name__ == '__main__':
     prob = AviaryProblem()
 
     # Load aircraft and options data from user
@@ -98,7 +99,14 @@ if __name__ == '__main__':
 
     prob.build_model()
 
-    prob.add_driver('SLSQP')
+    # AviaryProblem.add_driver declares total-jacobian coloring by default
+    # (use_coloring=True); with the sparse collocation problems Dymos builds, IPOPT then
+    # scales much better than SLSQP. IPOPT needs pyoptsparse, which is optional, so fall
+    # back to SLSQP without it.
+    if importlib.util.find_spec('pyoptsparse') is not None:
+        prob.add_driver('IPOPT', max_iter=200)
+    else:
+        prob.add_driver('SLSQP')
 
     prob.add_design_variables()
 
@@ -118,24 +126,25 @@ if __name__ == '__main__':
     prob.run_model()
     # prob.check_totals(compact_print=True, show_only_incorrect=True)
 
-    import numpy as np
-    
-    M_gross = prob.get_val(Mission.Summary.GROSS_MASS)
-    M_OEM = prob.get_val(Aircraft.Design.OPERATING_MASS)
-    M_PL = prob.get_val(Aircraft.CrewPayload.TOTAL_PAYLOAD_MASS)
-    M_BAT = prob.get_val(Aircraft.Battery.MASS)
-    M_F = prob.get_val(Mission.Summary.TOTAL_FUEL_MASS)
-    
+    M_gross = prob.get_val(Mission.Summary.GROSS_MASS)[0]
+    M_OEM = prob.get_val(Aircraft.Design.OPERATING_MASS)[0]
+    M_PL = prob.get_val(Aircraft.CrewPayload.TOTAL_PAYLOAD_MASS)[0]
+    M_BAT = prob.get_val(Aircraft.Battery.MASS)[0]
+    M_F = prob.get_val(Mission.Summary.TOTAL_FUEL_MASS)[0]
+    range_flown = prob.get_val(Mission.Summary.RANGE)[0]
+
     final_phase_name = 'descent'
+    soc = prob.get_val(f'traj.{final_phase_name}.timeseries.battery_state_of_charge')
+    mass = prob.get_val(f'traj.{final_phase_name}.timeseries.{Dynamic.Vehicle.MASS}')
 
-    print("Range:",np.round(prob.get_val(Mission.Summary.RANGE), 2))
-    print("Battery State of Charge:",np.round(prob.get_val('traj.descent.timeseries.battery_state_of_charge'), 2))
-        
-    print("Timeseries mass:",np.round(prob.get_val(f'traj.{final_phase_name}.timeseries.{Dynamic.Vehicle.MASS}'), 2))
-    print("M_gross:",np.round(M_gross, 2))
-    print("M_PL:",np.round(M_PL, 2))
-    print("M_OEM:",np.round(M_OEM, 2))
-    print("M_BAT:",np.round(M_BAT, 2))
-    print("M_F:",np.round(M_F, 2))
-    print("M_gross - (M_PL + M_OEM + M_F):",np.round(M_gross - (M_PL + M_OEM + M_F), 2))
-    print("Gross Mass:",np.round(prob.get_val(Mission.Summary.GROSS_MASS), 2))
+    # format directly for printing rather than building rounded copies of each array
+    print(f'Range: {range_flown:.2f}')
+    print('Battery State of Charge:', np.array2string(soc, precision=2, suppress_small=True))
+    print('Timeseries mass:', np.array2string(mass, precision=2, suppress_small=True))
+    print(f'M_gross: {M_gross:.2f}')
+    print(f'M_PL: {M_PL:.2f}')
+    print(f'M_OEM: {M_OEM:.2f}')
+    print(f'M_BAT: {M_BAT:.2f}')
+    print(f'M_F: {M_F:.2f}')
+    print(f'M_gross - (M_PL + M_OEM + M_F): {M_gross - (M_PL + M_OEM + M_F):.2f}')
+    print(f'Gross Mass: {M_gross:.2f}')
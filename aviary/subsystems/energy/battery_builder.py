@@ -5,6 +5,88 @@ from aviary.subsystems.energy.battery_sizing import SizeBattery
 from aviary.subsystems.subsystem_builder_base import SubsystemBuilderBase
 from aviary.variable_info.variables import Aircraft, Dynamic
 
+# width (kJ) of the smooth positive floor on the usable battery energy; negligible for any
+# real battery, but keeps the state of charge finite if the capacity is driven to zero
+_ENERGY_FLOOR_WIDTH = 1e-3
+
+
+def _smooth_energy_floor(energy):
+    """
+    Return a smooth, strictly positive floor of the usable energy and its derivative.
+
+    The floor 0.5 * (energy + sqrt(energy**2 + width**2)) approaches energy for
+    energy >> width and width / 2 at zero energy.
+    """
+    root = np.sqrt(energy * energy + _ENERGY_FLOOR_WIDTH * _ENERGY_FLOOR_WIDTH)
+    return 0.5 * (energy + root), 0.5 * (1.0 + energy / root)
+
+
+class StateOfChargeComp(om.ExplicitComponent):
+    """
+    Computes battery state of charge from the cumulative electric energy drawn, using the
+    battery efficiency as an overall efficiency.
+
+    The usable energy (efficiency * energy_capacity) passes through a smooth positive
+    floor, so a zero or negative capacity (e.g. in a line search) gives a large negative
+    but finite state of charge with nonzero derivatives, rather than a division by zero.
+    """
+
+    def initialize(self):
+        self.options.declare('num_nodes', types=int)
+
+    def setup(self):
+        nn = self.options['num_nodes']
+
+        self.add_input(
+            'energy_capacity', val=10.0, units='kJ', tags=['dymos.static_target']
+        )
+        self.add_input(
+            'efficiency', val=0.95, units='unitless', tags=['dymos.static_target']
+        )
+        self.add_input('cumulative_electric_energy_used', val=np.zeros(nn), units='kJ')
+
+        self.add_output('state_of_charge', val=np.zeros(nn), units='unitless')
+
+    def setup_partials(self):
+        nn = self.options['num_nodes']
+        ar = np.arange(nn)
+        zeros = np.zeros(nn, dtype=int)
+
+        self.declare_partials(
+            'state_of_charge', 'cumulative_electric_energy_used', rows=ar, cols=ar
+        )
+        self.declare_partials('state_of_charge', 'energy_capacity', rows=ar, cols=zeros)
+        self.declare_partials('state_of_charge', 'efficiency', rows=ar, cols=zeros)
+
+    def compute(self, inputs, outputs):
+        energy_capacity = inputs['energy_capacity']
+        efficiency = inputs['efficiency']
+        energy_used = inputs['cumulative_electric_energy_used']
+
+        soc = outputs['state_of_charge']
+
+        # no energy drawn yet (e.g. the initial guess): the battery is full
+        if not energy_used.any():
+            soc[:] = 1.0
+            return
+
+        # evaluate in place in the output array to avoid allocating temporaries
+        usable_energy, _ = _smooth_energy_floor(efficiency * energy_capacity)
+        np.divide(energy_used, usable_energy, out=soc)
+        np.subtract(1.0, soc, out=soc)
+
+    def compute_partials(self, inputs, J):
+        energy_capacity = inputs['energy_capacity']
+        efficiency = inputs['efficiency']
+        energy_used = inputs['cumulative_electric_energy_used']
+
+        denom, ddenom = _smooth_energy_floor(efficiency * energy_capacity)
+        dsoc_ddenom = energy_used * ddenom / (denom * denom)
+
+        J['state_of_charge', 'cumulative_electric_energy_used'] = -1.0 / denom
+        J['state_of_charge', 'energy_capacity'] = dsoc_ddenom * efficiency
+        J['state_of_charge', 'efficiency'] = dsoc_ddenom * energy_capacity
+
 
 class BatteryBuilder(SubsystemBuilderBase):
     """
@@ -30,6 +112,39 @@ class BatteryBuilder(SubsystemBuilderBase):
 
     default_name = 'battery'
 
+    def __init__(self, name=None, meta_data=None):
+        super().__init__(name=name, meta_data=meta_data)
+
+        # states and constraints only depend on the builder name, so they are built once
+        # here instead of on every call from the phase builders
+
+        # need to add subsystem name to target name ('battery.') for state due
+        # to issue where non aircraft or mission variables are not fully promoted
+        # TODO fix this by not promoting only 'aircraft:*' and 'mission:*'
+        self._state_dict = {
+            Dynamic.Vehicle.CUMULATIVE_ELECTRIC_ENERGY_USED: {
+                'fix_initial': True,
+                'fix_final': False,
+                'lower': 0.0,
+                'ref': 1e4,
+                'defect_ref': 1e6,
+                'units': 'kJ',
+                'rate_source': Dynamic.Vehicle.Propulsion.ELECTRIC_POWER_IN_TOTAL,
+                'input_initial': 0.0,
+                'targets': f'{self.name}.{Dynamic.Vehicle.CUMULATIVE_ELECTRIC_ENERGY_USED}',
+            }
+        }
+
+        self._constraint_dict = {
+            # Can add constraints here; state of charge is a common one in many
+            # battery applications
+            f'{self.name}.{Dynamic.Vehicle.BATTERY_STATE_OF_CHARGE}': {
+                'type': 'boundary',
+                'loc': 'final',
+                'lower': 0.1,
+            },
+        }
+
     def build_pre_mission(self, aviary_inputs=None):
         return SizeBattery(aviary_inputs=aviary_inputs)
 
@@ -39,14 +154,7 @@ class BatteryBuilder(SubsystemBuilderBase):
     def build_mission(self, num_nodes, aviary_inputs=None) -> om.Group:
         battery_group = om.Group()
         # Here, the efficiency variable is used as an overall efficiency for the battery
-        soc = om.ExecComp(
-            'state_of_charge = (energy_capacity - (cumulative_electric_energy_used/efficiency)) / energy_capacity',
-            state_of_charge={'val': np.zeros(num_nodes), 'units': 'unitless'},
-            energy_capacity={'val': 10.0, 'units': 'kJ'},
-            cumulative_electric_energy_used={'val': np.zeros(num_nodes), 'units': 'kJ'},
-            efficiency={'val': 0.95, 'units': 'unitless'},
-            has_diag_partials=True,
-        )
+        soc = StateOfChargeComp(num_nodes=num_nodes)
 
         battery_group.add_subsystem(
             'state_of_charge',
@@ -64,43 +172,23 @@ class BatteryBuilder(SubsystemBuilderBase):
 
         return battery_group
 
+    # callers (e.g. the phase builders) may modify the returned dicts, so hand out copies of
+    # the cached entries rather than the cached dicts themselves
     def get_states(self):
-        # need to add subsystem name to target name ('battery.') for state due
-        # to issue where non aircraft or mission variables are not fully promoted
-        # TODO fix this by not promoting only 'aircraft:*' and 'mission:*'
-        state_dict = {
-            Dynamic.Vehicle.CUMULATIVE_ELECTRIC_ENERGY_USED: {
-                'fix_initial': True,
-                'fix_final': False,
-                'lower': 0.0,
-                'ref': 1e4,
-                'defect_ref': 1e6,
-                'units': 'kJ',
-                'rate_source': Dynamic.Vehicle.Propulsion.ELECTRIC_POWER_IN_TOTAL,
-                'input_initial': 0.0,
-                'targets': f'{self.name}.{Dynamic.Vehicle.CUMULATIVE_ELECTRIC_ENERGY_USED}',
-            }
-        }
-
-        return state_dict
+        return {name: dict(options) for name, options in self._state_dict.items()}
 
     def get_constraints(self):
-        constraint_dict = {
-            # Can add constraints here; state of charge is a common one in many
-            # battery applications
-            f'{self.name}.{Dynamic.Vehicle.BATTERY_STATE_OF_CHARGE}': {
-                'type': 'boundary',
-                'loc': 'final',
-                'lower': 0.1,
-            },
-        }
-        return constraint_dict
+        return {name: dict(options) for name, options in self._constraint_dict.items()}
 
     def get_parameters(self, aviary_inputs=None, phase_info=None):
+        # energy capacity is constant over the mission, so it is passed to the ODE once
+        # rather than replicated at each node
         params = {
             Aircraft.Battery.ENERGY_CAPACITY: {
                 'val': 0.0,
                 'units': 'kJ',
+                'shape': (1,),
+                'static_target': True,
             },
         }
         return params
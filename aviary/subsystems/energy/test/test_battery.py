@@ -69,6 +69,64 @@ class TestBatteryDerivs(unittest.TestCase):
         partial_data = prob.check_partials(out_stream=None, method='cs')
         assert_check_partials(partial_data, atol=1e-9, rtol=1e-9)
 
+    def test_battery_mission_zero_capacity(self):
+        prob = self.prob
+        prob.model.add_subsystem(
+            'battery_mission', subsys=self.battery.build_mission(num_nodes=4), promotes=['*']
+        )
+
+        prob.model.set_input_defaults(av.Aircraft.Battery.ENERGY_CAPACITY, 0.0, units='kJ')
+        prob.model.set_input_defaults(av.Aircraft.Battery.EFFICIENCY, 0.95, units='unitless')
+        prob.model.set_input_defaults(
+            av.Dynamic.Vehicle.CUMULATIVE_ELECTRIC_ENERGY_USED,
+            [0, 2_000, 5_000, 9_500],
+            units='kJ',
+        )
+
+        prob.setup(force_alloc_complex=True)
+
+        prob.run_model()
+
+        soc = prob.get_val(av.Dynamic.Vehicle.BATTERY_STATE_OF_CHARGE, 'unitless')
+
+        # the usable energy is floored at half the 1e-3 kJ floor width
+        soc_expected = 1.0 - np.array([0, 2_000, 5_000, 9_500]) / 5e-4
+        assert_near_equal(soc, soc_expected, tolerance=1e-12)
+
+        partial_data = prob.check_partials(out_stream=None, method='cs')
+        assert_check_partials(partial_data, atol=1e-9, rtol=1e-9)
+
+        # the derivatives stay nonzero and accurate just above and below zero capacity
+        for energy_capacity in (1e-4, -1e-4):
+            prob.set_val(av.Aircraft.Battery.ENERGY_CAPACITY, energy_capacity, units='kJ')
+            prob.run_model()
+
+            soc = prob.get_val(av.Dynamic.Vehicle.BATTERY_STATE_OF_CHARGE, 'unitless')
+            self.assertTrue(np.all(np.isfinite(soc)))
+
+            partials = prob.check_partials(out_stream=None, method='cs')
+            assert_check_partials(partials, atol=1e-9, rtol=1e-9)
+
+            J = partials['battery_mission.state_of_charge'][
+                ('state_of_charge', 'energy_capacity')
+            ]['J_fwd']
+            self.assertTrue(np.all(J[1:] != 0.0))
+
+    def test_states_and_constraints_are_copies(self):
+        states = self.battery.get_states()
+        constraints = self.battery.get_constraints()
+
+        state_name = av.Dynamic.Vehicle.CUMULATIVE_ELECTRIC_ENERGY_USED
+        constraint_name = next(iter(constraints))
+
+        states[state_name]['lower'] = -1.0
+        states['extra'] = {}
+        constraints[constraint_name]['lower'] = 0.5
+
+        self.assertEqual(self.battery.get_states()[state_name]['lower'], 0.0)
+        self.assertNotIn('extra', self.battery.get_states())
+        self.assertEqual(self.battery.get_constraints()[constraint_name]['lower'], 0.1)
+
 
 class TestBattery(av.TestSubsystemBuilderBase):
     """
@@ -1,5 +1,6 @@
 import atexit
 from contextlib import ExitStack
+from functools import lru_cache
 import os
 from pathlib import Path
 from typing import Union
@@ -25,10 +26,14 @@ class Null:
         pass
 
 
+@lru_cache(maxsize=64)
 def get_aviary_resource_path(resource_name: str) -> Path:
     """
     Get the file path of a resource in the Aviary package.
 
+    Results are cached, so repeated lookups of the same resource neither rescan the
+    package nor register another cleanup handler.
+
     Parameters
     ----------
         resource_name : str
@@ -1,7 +1,11 @@
    # --- Built-ins ---
 from pathlib import Path
+from dataclasses import dataclass
+from functools import lru_cache
 import logging
+import math
 import numbers
+from typing import Optional, Tuple
 
 # --- Internal ---
 
@@ -16,63 +20,329 @@ BASE_DIR = Path(__file__).parents[0]
 # -------------------------------------------------
 def _coerce_nan(val):
     """Return np.nan for None, [] or (), else leave untouched."""
+    # fast path for the common case of a plain number
+    val_type = type(val)
+    if val_type is float or val_type is int:
+        return val
     if val is None:
         return np.nan
-    if isinstance(val, (list, tuple, np.ndarray)) and len(val) == 0:
+    if isinstance(val, (list, tuple)):
+        return val if val else np.nan
+    if isinstance(val, np.ndarray) and val.size == 0:
         return np.nan
     return val
 
 
-def power_transmission_computation(config, etas, supplied_power_ratio, shaft_power_ratio, throttle_setting, 
-                                   P_p, P_p1, P_p2, P_inst)-> \
-    tuple[float, float, float, float, float, dict]:
+def _safe_ratio(num, den):
+    """Return num / den, or NaN if den is NaN or numerically zero."""
+    # abs(NaN) > x is False, so a NaN denominator also returns NaN
+    return num / den if abs(den) > 1e-12 else np.nan
+
+
+def _case_matrices(e_GT, e_GB, e_P1, e_EM1, e_PM, e_EM2, e_P2):
     """
-    Translated from the MATLAB function 'PowerTransmissionComputationV3'.
-    See the original MATLAB docstring for full details. This function
-    computes the power flow along each power path for various hybrid
-    powertrain configurations.
+    Return the top 7 equations of the system matrix for each of the 9 power-flow-direction
+    cases, as a list of nine 7x10 nested lists.
 
-    Inputs:
+    Columns are the power paths 0=Pf, 1=Pgt, 2=Pgb, 3=Ps1, 4=Pe1, 5=Pbat, 6=Pe2, 7=Ps2,
+    8=Pp1, 9=Pp2.
+    """
+    return [
+        # -- CASE 1: nominal (all positive)
+        [
+            [-e_GT,  1,      0,      0,      0,      0,      0,      0,      0,      0],
+            [0,     -e_GB,   1,      1,      0,      0,      0,      0,      0,      0],
+            [0,      0,      0,     -e_P1,   0,      0,      0,      0,      1,      0],
+            [0,      0,     -e_EM1,  0,      1,      0,      0,      0,      0,      0],
+            [0,      0,      0,      0,     -e_PM,  -e_PM,   1,      0,      0,      0],
+            [0,      0,      0,      0,      0,      0,     -e_EM2,  1,      0,      0],
+            [0,      0,      0,      0,      0,      0,      0,     -e_P2,   0,      1]
+        ],
+        # -- CASE 2
+        [
+            [-e_GT,  1,      0,      0,      0,      0,      0,      0,      0,      0],
+            [0,     -e_GB,   1,      1,      0,      0,      0,      0,      0,      0],
+            [0,      0,      0,     -e_P1,   0,      0,      0,      0,      1,      0],
+            [0,      0,     -e_EM1,  0,      1,      0,      0,      0,      0,      0],
+            [0,      0,      0,      0,     -e_PM,  -1,      1,      0,      0,      0],
+            [0,      0,      0,      0,      0,      0,     -e_EM2,  1,      0,      0],
+            [0,      0,      0,      0,      0,      0,      0,     -e_P2,   0,      1]
+        ],
+        # -- CASE 3
+        [
+            [-e_GT,   1,       0,       0,      0,      0,       0,       0,      0,      0],
+            [0,      -e_GB,    1,       1,      0,      0,       0,       0,      0,      0],
+            [0,       0,       0,      -e_P1,   0,      0,       0,       0,      1,      0],
+            [0,       0,      -e_EM1,   0,      1,      0,       0,       0,      0,      0],
+            [0,       0,       0,       0,     -e_PM,  -1,       e_PM,    0,      0,      0],
+            [0,       0,       0,       0,      0,      0,      -1,       e_EM2,  0,      0],
+            [0,       0,       0,       0,      0,      0,       0,      -1,      0,      e_P2]
+        ],
+        # -- CASE 4
+        [
+            [-e_GT,  1,       0,       0,       0,      0,      0,      0,      0,      0],
+            [0,     -e_GB,    e_GB,    1,       0,      0,      0,      0,      0,      0],
+            [0,      0,       0,      -e_P1,    0,      0,      0,      0,      1,      0],
+            [0,      0,      -1,       0,       e_EM1,  0,      0,      0,      0,      0],
+            [0,      0,       0,       0,      -1,     -e_PM,   1,      0,      0,      0],
+            [0,      0,       0,       0,       0,      0,     -e_EM2,  1,      0,      0],
+            [0,      0,       0,       0,       0,      0,      0,     -e_P2,   0,      1]
+        ],
+        # -- CASE 5
+        [
+            [-e_GT,  1,       0,       0,      0,      0,      0,       0,      0,      0],
+            [0,     -e_GB,    e_GB,    1,      0,      0,      0,       0,      0,      0],
+            [0,      0,       0,      -e_P1,   0,      0,      0,       0,      1,      0],
+            [0,      0,      -1,       0,      e_EM1,  0,      0,       0,      0,      0],
+            [0,      0,       0,       0,     -1,     -e_PM,   e_PM,    0,      0,      0],
+            [0,      0,       0,       0,      0,      0,     -1,       e_EM2,  0,      0],
+            [0,      0,       0,       0,      0,      0,      0,      -1,      0,      e_P2]
+        ],
+        # -- CASE 6
+        [
+            [-e_GT,  1,       0,       0,      0,       0,       0,       0,      0,      0],
+            [0,     -e_GB,    e_GB,    1,      0,       0,       0,       0,      0,      0],
+            [0,      0,       0,      -e_P1,   0,       0,       0,       0,      1,      0],
+            [0,      0,      -1,       0,      e_EM1,   0,       0,       0,      0,      0],
+            [0,      0,       0,       0,     -1,      -1,       e_PM,    0,      0,      0],
+            [0,      0,       0,       0,      0,       0,      -1,       e_EM2,  0,      0],
+            [0,      0,       0,       0,      0,       0,       0,      -1,      0,      e_P2]
+        ],
+        # -- CASE 7
+        [
+            [-e_GT,  1,      0,       0,      0,      0,      0,      0,      0,      0],
+            [0,     -e_GB,   1,       e_GB,   0,      0,      0,      0,      0,      0],
+            [0,      0,      0,      -1,      0,      0,      0,      0,      e_P1,   0],
+            [0,      0,     -e_EM1,   0,      1,      0,      0,      0,      0,      0],
+            [0,      0,      0,       0,     -e_PM,  -e_PM,   1,      0,      0,      0],
+            [0,      0,      0,       0,      0,      0,     -e_EM2,  1,      0,      0],
+            [0,      0,      0,       0,      0,      0,      0,     -e_P2,   0,      1]
+        ],
+        # -- CASE 8
+        [
+            [-e_GT,  1,      0,       0,      0,      0,      0,      0,      0,      0],
+            [0,     -e_GB,   1,       e_GB,   0,      0,      0,      0,      0,      0],
+            [0,      0,      0,      -1,      0,      0,      0,      0,      e_P1,   0],
+            [0,      0,     -e_EM1,   0,      1,      0,      0,      0,      0,      0],
+            [0,      0,      0,       0,     -e_PM,  -1,      1,      0,      0,      0],
+            [0,      0,      0,       0,      0,      0,     -e_EM2,  1,      0,      0],
+            [0,      0,      0,       0,      0,      0,      0,     -e_P2,   0,      1]
+        ],
+        # -- CASE 9
+        [
+            [-e_GT,  1,      0,       0,      0,      0,      0,      0,      0,      0],
+            [0,     -e_GB,   1,       e_GB,   0,      0,      0,      0,      0,      0],
+            [0,      0,      0,      -1,      0,      0,      0,      0,      e_P1,   0],
+            [0,      0,     -e_EM1,   0,      1,      0,      0,      0,      0,      0],
+            [0,      0,      0,       0,     -e_PM,  -1,      e_PM,   0,      0,      0],
+            [0,      0,      0,       0,      0,      0,     -1,      e_EM2,  0,      0],
+            [0,      0,      0,       0,      0,      0,      0,     -1,      0,      e_P2]
+        ],
+    ]
+
+
+# Efficiency order used for the coefficient tables below
+_ETA_KEYS = ('GT', 'GB', 'P1', 'EM1', 'PM', 'EM2', 'P2')
+
+# Every entry of the case matrices is either a constant or +/- one efficiency, so they are
+# linear in the efficiencies: A_top = _CASE_CONST + _CASE_ETA_COEFF @ e_vec. Both tables are
+# derived once from _case_matrices at import, with shape (9, 7, 10) and (9, 7, 10, 7).
+_CASE_CONST = np.array(_case_matrices(*np.zeros(7)), dtype=float)
+_CASE_ETA_COEFF = np.stack(
+    [np.array(_case_matrices(*np.eye(7)[i]), dtype=float) - _CASE_CONST for i in range(7)],
+    axis=-1,
+)
+
+
+@lru_cache(maxsize=64)
+def _case_top_matrices(eta_values):
+    """
+    Return the top 7 equations of all 9 cases for one set of efficiencies.
+
+    Parameters
+    ----------
+    eta_values : tuple of float
+        Component efficiencies in _ETA_KEYS order.
+
+    Returns
     -------
+    np.ndarray
+        Read-only array of shape (9, 7, 10). It is shared between calls with the same
+        efficiencies, which is the common case along a mission.
+    """
+    A_top = _CASE_CONST + _CASE_ETA_COEFF @ np.array(eta_values)
+    A_top.setflags(write=False)
+    return A_top
+
+# Columns checked for the sign assumption of each case: Pgt, Ps1, Pe1, Pbat, Pe2
+_SIGN_COLS = [1, 3, 4, 5, 6]
+
+# Expected sign of those columns for cases 1..9: +1 means >= 0, -1 means < 0
+_SIGN_TABLE = np.array([
+    [1,  1,  1,  1,  1],
+    [1,  1,  1, -1,  1],
+    [1,  1,  1, -1, -1],
+    [1,  1, -1,  1,  1],
+    [1,  1, -1,  1, -1],
+    [1,  1, -1, -1, -1],
+    [1, -1,  1,  1,  1],
+    [1, -1,  1, -1,  1],
+    [1, -1,  1, -1, -1],
+], dtype=np.int8)
+
+# Operating-condition equation rows for phi, Phi, xi, P_p, P_p1 and P_p2. The phi and Phi
+# rows depend on the ratio values and the xi row on the throttle component, so those are
+# filled in per call.
+_OC_ROWS = np.array([
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 1, 1],
+    [0, 0, 0, 0, 0, 0, 0, 0, 1, 0],
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+], dtype=float)
+
+# Throttle equation row for each xi_config
+_THROTTLE_ROWS = {
+    # GT throttle
+    1: [0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+    # e-1 or dual-e => e1 path; e1 is negative in the nominal direction for e-1
+    2: [0, 0, 0, 0, -1, 0, 0, 0, 0, 0],
+    # e2 path
+    3: [0, 0, 0, 0, 0, 0, 1, 0, 0, 0],
+}
+
+
+@dataclass(frozen=True)
+class _ConfigSpec:
+    """
+    Fixed settings of one powertrain configuration.
+
+    Attributes
+    ----------
+    supplied_power_ratio : float or None
+        Value the supplied power ratio is forced to, or None if it is an input.
+    shaft_power_ratio : float or None
+        Value the shaft power ratio is forced to, or None if it is an input.
+    OC : tuple of str
+        Names of the operating conditions that may be specified for this configuration.
+    DOFs : int
+        Number of operating conditions that must be specified.
+    throttle_config : int
+        Component the throttle refers to: 1 = GT, 2 = primary EM, 3 = secondary EM.
+    combis : tuple of int
+        Power-flow sign combinations (cases 1..9) to check.
+    throttle_config_all_electric : int or None
+        Throttle component used instead when the supplied power ratio is 1.
+    unused : tuple of str
+        Power paths that do not exist in this configuration; they are returned as NaN.
+    """
+
+    supplied_power_ratio: Optional[float]
+    shaft_power_ratio: Optional[float]
+    OC: Tuple[str, ...]
+    DOFs: int
+    throttle_config: int
+    combis: Tuple[int, ...]
+    throttle_config_all_electric: Optional[int] = None
+    unused: Tuple[str, ...] = ()
+
+
+# Keyed by lower-case config name, since the config argument is lower-cased before lookup
+_CONFIG_TABLE = {
+    'conventional': _ConfigSpec(
+        0, 0, ('xi', 'P_p', 'P_p1'), 1, 1, (1,),
+        unused=('gb', 'e1', 'bat', 'e2', 's2', 'p2'),
+    ),
+    'turboelectric': _ConfigSpec(
+        0, 1, ('xi', 'P_p', 'P_p2'), 1, 1, (1,),
+        unused=('s1', 'p1', 'bat'),
+    ),
+    'serial': _ConfigSpec(
+        None, 1, ('phi', 'xi', 'P_p', 'P_p2'), 2, 1, (1, 2, 3), 3,
+        unused=('s1', 'p1'),
+    ),
+    'parallel': _ConfigSpec(
+        None, 0, ('phi', 'xi', 'P_p', 'P_p1'), 2, 1, (1, 2, 4, 8), 2,
+        unused=('s2', 'p2', 'e2'),
+    ),
+    'pte': _ConfigSpec(
+        0, None, ('Phi', 'xi', 'P_p', 'P_p1', 'P_p2'), 2, 1, (1, 5, 7),
+        unused=('bat',),
+    ),
+    # SPPH uses every power path
+    'spph': _ConfigSpec(
+        None, None, ('phi', 'Phi', 'xi', 'P_p', 'P_p1', 'P_p2'), 3, 1, tuple(range(1, 10)), 3,
+    ),
+    'e-1': _ConfigSpec(
+        1, 0, ('xi', 'P_p', 'P_p1'), 1, 2, (4, 8),
+        unused=('f', 'gt', 'e2', 's2', 'p2'),
+    ),
+    'e-2': _ConfigSpec(
+        1, 1, ('xi', 'P_p', 'P_p2'), 1, 3, (1, 3),
+        unused=('f', 'gt', 'gb', 's1', 'p1', 'e1'),
+    ),
+    'dual-e': _ConfigSpec(
+        1, None, ('xi', 'Phi', 'P_p', 'P_p1', 'P_p2'), 2, 2, (4, 5, 6, 7, 8, 9),
+        unused=('f', 'gt'),
+    ),
+}
+
+# Power path names in solution-vector order
+_PATH_KEYS = ('f', 'gt', 'gb', 's1', 'e1', 'bat', 'e2', 's2', 'p1', 'p2')
+
+# Boolean mask over _PATH_KEYS of the paths each configuration does not have
+_UNUSED_MASK = {
+    name: np.array([key in spec.unused for key in _PATH_KEYS])
+    for name, spec in _CONFIG_TABLE.items()
+}
+
+
+@dataclass(frozen=True)
+class _PowertrainSystem:
+    """
+    Linear systems of one operating point, assembled for all candidate sign cases.
+
+    Attributes
+    ----------
     config : str
-        Powertrain layout (e.g. 'conventional', 'turboelectric', 'serial', etc.)
-    etas   : dict
-        Dictionary of component efficiencies with fields:
-        { 'GT', 'GB', 'P1', 'EM1', 'PM', 'EM2', 'P2' } (all in (0,1))
-    supplied_power_ratio    : float or NaN
-        Supplied power ratio [-],  P_bat / (P_bat + P_f)
-    shaft_power_ratio    : float or NaN
-        Shaft power ratio [-],  P_s2 / (P_s2 + P_s1)
-    throttle_setting     : float or NaN
-        Throttle setting [-], see notes in original docstring
-    P_p    : float or NaN
-        Total propulsive power [W]
-    P_p1   : float or NaN
-        Propulsive power from primary propulsor(s) [W]
-    P_p2   : float or NaN
-        Propulsive power from secondary propulsor(s) [W]
-    P_inst : float or NaN
-        Maximum installed power of GT or EM in this flight condition [W]
+        Lower-case powertrain configuration name.
+    supplied_power_ratio : float
+        Supplied power ratio after coercion and the configuration's forced value.
+    shaft_power_ratio : float
+        Shaft power ratio after coercion and the configuration's forced value.
+    P_inst : float
+        Installed power after coercion.
+    throttle_config : int
+        Component the throttle refers to: 1 = GT, 2 = primary EM, 3 = secondary EM.
+    zero_is_solution : bool
+        True if no power or throttle is demanded, so all powers are zero.
+    k_idxs : np.ndarray
+        0-based indices of the candidate sign cases.
+    A_stack : np.ndarray
+        System matrix of each candidate case, shape (n_combis, 10, 10).
+    b : np.ndarray
+        Right-hand side shared by all candidate cases, shape (10,).
+    """
 
-    Returns:
-    --------
-    P_out     : dict
-        Dictionary with the power flow in each path
-        { 'f','gt','gb','s1','e1','bat','e2','s2','p1','p2','p' }
-    xi_out    : float
-        Actual throttle used in the solution ([-])
-    phi_out   : float
-        Actual supplied power ratio ([-])
-    Phi_out   : float
-        Actual shaft power ratio ([-])
-    solution  : np.ndarray of length 9
-        A binary array indicating which of the 9 power-flow-direction
-        combinations yielded a feasible solution
-    xi_config : int
-        Indicates which component throttle refers to:
-        1 = Gas turbine, 2 = Primary EM, 3 = Secondary EM.
+    config: str
+    supplied_power_ratio: float
+    shaft_power_ratio: float
+    P_inst: float
+    throttle_config: int
+    zero_is_solution: bool
+    k_idxs: np.ndarray
+    A_stack: np.ndarray
+    b: np.ndarray
+
+
+def _build_system(config, etas, supplied_power_ratio, shaft_power_ratio, throttle_setting,
+                  P_p, P_p1, P_p2, P_inst) -> _PowertrainSystem:
     """
+    Check the inputs of one operating point and assemble its linear systems.
 
+    This covers steps 1 to 5 of power_transmission_computation; see there for the arguments.
+    """
     # --- 1) Assign input ---
     # --- 1) normalise "empty" inputs -------------------------------------
     supplied_power_ratio = _coerce_nan(supplied_power_ratio)
@@ -84,15 +354,6 @@ def power_transmission_computation(config, etas, supplied_power_ratio, shaft_pow
     P_inst               = _coerce_nan(P_inst)
 
 
-    # Extract component efficiencies
-    e_GT  = etas['GT']
-    e_GB  = etas['GB']
-    e_P1  = etas['P1']
-    e_EM1 = etas['EM1']
-    e_PM  = etas['PM']
-    e_EM2 = etas['EM2']
-    e_P2  = etas['P2']
-
     # Convert empty ([]) to NaN if needed
     # (Assuming you pass in np.nan already if not used. If not, you can add checks here.)
 
@@ -106,112 +367,55 @@ def power_transmission_computation(config, etas, supplied_power_ratio, shaft_pow
         raise ValueError("Cannot specify P_p, P_p1, and P_p2 simultaneously.")
 
     # 2b) Ensure Pp, Pp1/Pp2, and Phi are not overspecified
-    if (np.sum([~np.isnan(shaft_power_ratio), ~np.isnan(P_p1), ~np.isnan(P_p2)]) == 3 or
-        np.sum([~np.isnan(shaft_power_ratio), ~np.isnan(P_p),  ~np.isnan(P_p1)]) == 3 or
-        np.sum([~np.isnan(shaft_power_ratio), ~np.isnan(P_p),  ~np.isnan(P_p2)]) == 3):
+    # (bools add as ints, so each sum counts the specified values)
+    Phi_set = not math.isnan(shaft_power_ratio)
+    P_p_set = not math.isnan(P_p)
+    P_p1_set = not math.isnan(P_p1)
+    P_p2_set = not math.isnan(P_p2)
+    if (Phi_set + P_p1_set + P_p2_set == 3 or
+        Phi_set + P_p_set + P_p1_set == 3 or
+        Phi_set + P_p_set + P_p2_set == 3):
         raise ValueError("Cannot specify Phi together with both P_p1 and P_p2 (or P_p).")
 
-    # Initialize some variables we fill in the switch/case logic
-    combis = []
-    throttle_config = 1  # 1 = GT by default, see below
-
     config = config.lower()
-    # Choose how many DOFs are expected, and fix some inputs depending on config
-    if config == 'conventional':
-        # Enforce OCs
-        supplied_power_ratio = 0
-        shaft_power_ratio = 0
-        # The relevant set of input OCs
-        OC = [throttle_setting, P_p, P_p1]
-        DOFs = 1
-        throttle_config = 1
-        combis = [1]  # Which sign-combinations to check
-
-    elif config == 'turboelectric':
-        supplied_power_ratio = 0
-        shaft_power_ratio = 1
-        OC = [throttle_setting, P_p, P_p2]
-        DOFs = 1
-        throttle_config = 1
-        combis = [1]
-
-    elif config == 'serial':
-        shaft_power_ratio = 1
-        # possible OCs: phi, xi, P_p, P_p2
-        OC = [supplied_power_ratio, throttle_setting, P_p, P_p2]
-        DOFs = 2
-        combis = [1, 2, 3]
-        if supplied_power_ratio == 1:
-            # Then throttle must refer to EM2
-            throttle_config = 3
-
-    elif config == 'parallel':
-        shaft_power_ratio = 0
-        # possible OCs: phi, xi, P_p, P_p1
-        OC = [supplied_power_ratio, throttle_setting, P_p, P_p1]
-        DOFs = 2
-        combis = [1, 2, 4, 8]
-        if supplied_power_ratio == 1:
-            # Then throttle must refer to EM1
-            throttle_config = 2
-
-    elif config == 'PTE':
-        supplied_power_ratio = 0
-        # possible OCs: Phi, xi, P_p, P_p1, P_p2
-        OC = [shaft_power_ratio, throttle_setting, P_p, P_p1, P_p2]
-        DOFs = 2
-        throttle_config = 1
-        combis = [1, 5, 7]
-
-    elif config == 'SPPH':
-        # possible OCs: phi, Phi, xi, P_p, P_p1, P_p2
-        OC = [supplied_power_ratio, shaft_power_ratio, throttle_setting, P_p, P_p1, P_p2]
-        DOFs = 3
-        combis = [1, 2, 3, 4, 5, 6, 7, 8, 9]
-        if supplied_power_ratio == 1:
-            throttle_config = 3
-
-    elif config == 'e-1':
-        supplied_power_ratio = 1
-        shaft_power_ratio = 0
-        # possible OCs: xi, P_p, P_p1
-        OC = [throttle_setting, P_p, P_p1]
-        DOFs = 1
-        throttle_config = 2
-        combis = [4, 8]
-
-    elif config == 'e-2':
-        supplied_power_ratio = 1
-        shaft_power_ratio = 1
-        # possible OCs: xi, P_p, P_p2
-        OC = [throttle_setting, P_p, P_p2]
-        DOFs = 1
-        throttle_config = 3
-        combis = [1, 3]
-
-    elif config == 'dual-e':
-        supplied_power_ratio = 1
-        # possible OCs: xi, Phi, P_p, P_p1, P_p2
-        OC = [throttle_setting, shaft_power_ratio, P_p, P_p1, P_p2]
-        DOFs = 2
-        throttle_config = 2
-        combis = [4, 5, 6, 7, 8, 9]
-
-    else:
+    spec = _CONFIG_TABLE.get(config)
+    if spec is None:
         raise ValueError("Unrecognized config option: " + str(config))
 
+    # Enforce the OCs fixed by this configuration
+    if spec.supplied_power_ratio is not None:
+        supplied_power_ratio = spec.supplied_power_ratio
+    if spec.shaft_power_ratio is not None:
+        shaft_power_ratio = spec.shaft_power_ratio
+
+    DOFs = spec.DOFs
+    combis = spec.combis
+    throttle_config = spec.throttle_config
+    if spec.throttle_config_all_electric is not None and supplied_power_ratio == 1:
+        throttle_config = spec.throttle_config_all_electric
+
+    # The relevant set of input OCs for this configuration
+    inputs = {
+        'phi': supplied_power_ratio,
+        'Phi': shaft_power_ratio,
+        'xi': throttle_setting,
+        'P_p': P_p,
+        'P_p1': P_p1,
+        'P_p2': P_p2,
+    }
+    OC = [inputs[name] for name in spec.OC]
+
     # Check number of DOFs actually specified vs required
     # "OC" here is just a subset of possible inputs - count how many are not NaN
-    OC = [_coerce_nan(iOC) for iOC in OC]
-    if np.sum(~np.isnan(OC)) != DOFs:
-        print(OC, DOFs)
+    # (the inputs were already coerced on entry)
+    if sum(not math.isnan(iOC) for iOC in OC) != DOFs:
         raise ValueError(
             f"For a '{config}' configuration, exactly {DOFs} DOF(s) must be specified. "
             "Check your inputs."
         )
 
     # If throttle is given, P_inst must also be given
-    if (not np.isnan(throttle_setting)) and np.isnan(P_inst):
+    if (not math.isnan(throttle_setting)) and math.isnan(P_inst):
         raise ValueError(
             "If throttle xi is specified, you must supply P_inst for the GT or EM."
         )
@@ -222,12 +426,12 @@ def power_transmission_computation(config, etas, supplied_power_ratio, shaft_pow
         if x is None:
             return True
         else:
-            return (np.isnan(x) or x == 0.0)
+            return (math.isnan(x) or x == 0.0)
 
     P_pSwitch  = 0 if is_zero_or_nan(P_p)  else 1
     P_p1Switch = 0 if is_zero_or_nan(P_p1) else 1
     P_p2Switch = 0 if is_zero_or_nan(P_p2) else 1
-    if (not np.isnan(throttle_setting)) and (not np.isnan(P_inst)):
+    if (not math.isnan(throttle_setting)) and (not math.isnan(P_inst)):
         xiSwitch = 0 if (throttle_setting == 0 or P_inst == 0) else 1
     else:
         xiSwitch = 0
@@ -237,229 +441,186 @@ def power_transmission_computation(config, etas, supplied_power_ratio, shaft_pow
         zeroIsASolution = 1
 
     # --- 4) Build system matrix A_top for the 9 flow‐direction cases (7 eqs per combination) ---
-    # A_top has shape (7, 10, 9). We'll fill them with np.nan and then plug in each row.
-    A_top = np.full((7, 10, 9), np.nan)
-
-    # For code clarity, define indices for each power path column:
-    # 0=Pf, 1=Pgt, 2=Pgb, 3=Ps1, 4=Pe1, 5=Pbat, 6=Pe2, 7=Ps2, 8=Pp1, 9=Pp2
-
-    # -- CASE 1: nominal (all positive)
-    A_top[:,:,0] = np.array([
-        [-e_GT,  1,      0,      0,      0,      0,      0,      0,      0,      0],
-        [0,     -e_GB,   1,      1,      0,      0,      0,      0,      0,      0],
-        [0,      0,      0,     -e_P1,   0,      0,      0,      0,      1,      0],
-        [0,      0,     -e_EM1,  0,      1,      0,      0,      0,      0,      0],
-        [0,      0,      0,      0,     -e_PM,  -e_PM,   1,      0,      0,      0],
-        [0,      0,      0,      0,      0,      0,     -e_EM2,  1,      0,      0],
-        [0,      0,      0,      0,      0,      0,      0,     -e_P2,   0,      1]
-    ])
-
-    # -- CASE 2
-    A_top[:,:,1] = np.array([
-        [-e_GT,  1,      0,      0,      0,      0,      0,      0,      0,      0],
-        [0,     -e_GB,   1,      1,      0,      0,      0,      0,      0,      0],
-        [0,      0,      0,     -e_P1,   0,      0,      0,      0,      1,      0],
-        [0,      0,     -e_EM1,  0,      1,      0,      0,      0,      0,      0],
-        [0,      0,      0,      0,     -e_PM,  -1,      1,      0,      0,      0],
-        [0,      0,      0,      0,      0,      0,     -e_EM2,  1,      0,      0],
-        [0,      0,      0,      0,      0,      0,      0,     -e_P2,   0,      1]
-    ])
-
-    # -- CASE 3
-    A_top[:,:,2] = np.array([
-        [-e_GT,   1,       0,       0,      0,      0,       0,       0,      0,      0],
-        [0,      -e_GB,    1,       1,      0,      0,       0,       0,      0,      0],
-        [0,       0,       0,      -e_P1,   0,      0,       0,       0,      1,      0],
-        [0,       0,      -e_EM1,   0,      1,      0,       0,       0,      0,      0],
-        [0,       0,       0,       0,     -e_PM,  -1,       e_PM,    0,      0,      0],
-        [0,       0,       0,       0,      0,      0,      -1,       e_EM2,  0,      0],
-        [0,       0,       0,       0,      0,      0,       0,      -1,      0,      e_P2]
-    ])
-
-    # -- CASE 4
-    A_top[:,:,3] = np.array([
-        [-e_GT,  1,       0,       0,       0,      0,      0,      0,      0,      0],
-        [0,     -e_GB,    e_GB,    1,       0,      0,      0,      0,      0,      0],
-        [0,      0,       0,      -e_P1,    0,      0,      0,      0,      1,      0],
-        [0,      0,      -1,       0,       e_EM1,  0,      0,      0,      0,      0],
-        [0,      0,       0,       0,      -1,     -e_PM,   1,      0,      0,      0],
-        [0,      0,       0,       0,       0,      0,     -e_EM2,  1,      0,      0],
-        [0,      0,       0,       0,       0,      0,      0,     -e_P2,   0,      1]
-    ])
-
-    # -- CASE 5
-    A_top[:,:,4] = np.array([
-        [-e_GT,  1,       0,       0,      0,      0,      0,       0,      0,      0],
-        [0,     -e_GB,    e_GB,    1,      0,      0,      0,       0,      0,      0],
-        [0,      0,       0,      -e_P1,   0,      0,      0,       0,      1,      0],
-        [0,      0,      -1,       0,      e_EM1,  0,      0,       0,      0,      0],
-        [0,      0,       0,       0,     -1,     -e_PM,   e_PM,    0,      0,      0],
-        [0,      0,       0,       0,      0,      0,     -1,       e_EM2,  0,      0],
-        [0,      0,       0,       0,      0,      0,      0,      -1,      0,      e_P2]
-    ])
-
-    # -- CASE 6
-    A_top[:,:,5] = np.array([
-        [-e_GT,  1,       0,       0,      0,       0,       0,       0,      0,      0],
-        [0,     -e_GB,    e_GB,    1,      0,       0,       0,       0,      0,      0],
-        [0,      0,       0,      -e_P1,   0,       0,       0,       0,      1,      0],
-        [0,      0,      -1,       0,      e_EM1,   0,       0,       0,      0,      0],
-        [0,      0,       0,       0,     -1,      -1,       e_PM,    0,      0,      0],
-        [0,      0,       0,       0,      0,       0,      -1,       e_EM2,  0,      0],
-        [0,      0,       0,       0,      0,       0,       0,      -1,      0,      e_P2]
-    ])
-
-    # -- CASE 7
-    A_top[:,:,6] = np.array([
-        [-e_GT,  1,      0,       0,      0,      0,      0,      0,      0,      0],
-        [0,     -e_GB,   1,       e_GB,   0,      0,      0,      0,      0,      0],
-        [0,      0,      0,      -1,      0,      0,      0,      0,      e_P1,   0],
-        [0,      0,     -e_EM1,   0,      1,      0,      0,      0,      0,      0],
-        [0,      0,      0,       0,     -e_PM,  -e_PM,   1,      0,      0,      0],
-        [0,      0,      0,       0,      0,      0,     -e_EM2,  1,      0,      0],
-        [0,      0,      0,       0,      0,      0,      0,     -e_P2,   0,      1]
-    ])
-
-    # -- CASE 8
-    A_top[:,:,7] = np.array([
-        [-e_GT,  1,      0,       0,      0,      0,      0,      0,      0,      0],
-        [0,     -e_GB,   1,       e_GB,   0,      0,      0,      0,      0,      0],
-        [0,      0,      0,      -1,      0,      0,      0,      0,      e_P1,   0],
-        [0,      0,     -e_EM1,   0,      1,      0,      0,      0,      0,      0],
-        [0,      0,      0,       0,     -e_PM,  -1,      1,      0,      0,      0],
-        [0,      0,      0,       0,      0,      0,     -e_EM2,  1,      0,      0],
-        [0,      0,      0,       0,      0,      0,      0,     -e_P2,   0,      1]
-    ])
-
-    # -- CASE 9
-    A_top[:,:,8] = np.array([
-        [-e_GT,  1,      0,       0,      0,      0,      0,      0,      0,      0],
-        [0,     -e_GB,   1,       e_GB,   0,      0,      0,      0,      0,      0],
-        [0,      0,      0,      -1,      0,      0,      0,      0,      e_P1,   0],
-        [0,      0,     -e_EM1,   0,      1,      0,      0,      0,      0,      0],
-        [0,      0,      0,       0,     -e_PM,  -1,      e_PM,   0,      0,      0],
-        [0,      0,      0,       0,      0,      0,     -1,      e_EM2,  0,      0],
-        [0,      0,      0,       0,      0,      0,      0,     -1,      0,      e_P2]
-    ])
+    # A_top has shape (9, 7, 10): one 7x10 block per case, assembled from the precomputed
+    # coefficient tables and cached per set of efficiencies.
+    A_top = _case_top_matrices(tuple(float(etas[key]) for key in _ETA_KEYS))
 
     # b_top is always zeros for the top 7 eqs
     b_top = np.zeros(7)
 
     # --- 5) Select & build the 3 "operating condition" equations (A_bot, b_bot) ---
-    A_bot = np.full((3,10), np.nan)
-    b_bot = np.full(3, np.nan)
-
-    # We'll fill row by row:
-    eqN = 0
-
-    # Helper function to store row in A_bot, b_bot:
-    def set_eq(row_vec, rhs):
-        nonlocal eqN
-        A_bot[eqN,:] = row_vec
-        b_bot[eqN]   = rhs
-        eqN += 1
-
-    # The order of "k" below matters because we match the original code's
-    # indexing for phi (k=1), Phi (k=2), xi (k=3), P_p (k=4), P_p1 (k=5), P_p2 (k=6).
-    # We'll just manually check each input in that order:
-    if not np.isnan(supplied_power_ratio):  # k=1
-        # A_bot(eqN,:) = [phi, 0, 0, 0, 0, (phi-1), 0, 0, 0, 0]
-        set_eq([ supplied_power_ratio, 0,   0,   0,   0, (supplied_power_ratio - 1), 0,   0,   0,  0 ], 0.0)
-
-    if not np.isnan(shaft_power_ratio):  # k=2
-        # A_bot(eqN,:) = [0, 0, 0, Phi, 0, 0, 0, (Phi-1), 0, 0]
-        set_eq([ 0,   0,  0,  shaft_power_ratio,  0,   0,   0, (shaft_power_ratio-1), 0,  0 ], 0.0)
-
-    if not np.isnan(throttle_setting):   # k=3
-        # depends on xi_config
-        if throttle_config == 1:   # GT throttle
-            row = [0, 1, 0, 0, 0, 0, 0, 0, 0, 0]
-        elif throttle_config == 2: # e-1 or dual-e => e1 path
-            # Note we have negative e1 in the nominal direction for e-1
-            row = [0, 0, 0, 0, -1, 0, 0, 0, 0, 0]
-        else:                # xi_config == 3 => e2 path
-            row = [0, 0, 0, 0, 0, 0, 1, 0, 0, 0]
-
-        set_eq(row, throttle_setting * P_inst)
-
-    if not np.isnan(P_p):  # k=4
-        # A_bot(eqN,:) = [0,0,0,0,0,0,0,0,1,1]
-        set_eq([0, 0, 0, 0, 0, 0, 0, 0, 1, 1], P_p)
-
-    if not np.isnan(P_p1): # k=5
-        set_eq([0, 0, 0, 0, 0, 0, 0, 0, 1, 0], P_p1)
-
-    if not np.isnan(P_p2): # k=6
-        set_eq([0, 0, 0, 0, 0, 0, 0, 0, 0, 1], P_p2)
-
-    # If fewer than 3 eqs were set, fill the remainder with zeros:
-    while eqN < 3:
-        A_bot[eqN,:] = 0
-        b_bot[eqN]   = 0
-        eqN += 1
+    # The order of the candidate rows matches the original code's indexing for
+    # phi (k=1), Phi (k=2), xi (k=3), P_p (k=4), P_p1 (k=5), P_p2 (k=6); only the
+    # specified (non-NaN) ones are used.
+    oc_values = (supplied_power_ratio, shaft_power_ratio, throttle_setting, P_p, P_p1, P_p2)
+    active = np.array([not math.isnan(value) for value in oc_values])
+
+    A_oc = _OC_ROWS.copy()
+    # phi row: [phi, 0, 0, 0, 0, (phi-1), 0, 0, 0, 0]
+    A_oc[0, 0] = supplied_power_ratio
+    A_oc[0, 5] = supplied_power_ratio - 1
+    # Phi row: [0, 0, 0, Phi, 0, 0, 0, (Phi-1), 0, 0]
+    A_oc[1, 3] = shaft_power_ratio
+    A_oc[1, 7] = shaft_power_ratio - 1
+    # the throttle row depends on xi_config
+    A_oc[2] = _THROTTLE_ROWS[throttle_config]
+    b_oc = np.array([0.0, 0.0, throttle_setting * P_inst, P_p, P_p1, P_p2])
+
+    n_eqs = int(active.sum())
+    if n_eqs > 3:
+        raise ValueError(
+            f"Too many operating conditions specified for a '{config}' configuration."
+        )
+
+    # If fewer than 3 eqs were set, the remainder is zeros
+    A_bot = np.zeros((3, 10))
+    b_bot = np.zeros(3)
+    A_bot[:n_eqs] = A_oc[active]
+    b_bot[:n_eqs] = b_oc[active]
 
     # Merge top/bot to form full system: A and b
     # top (7 eqs) + bot (3 eqs) => 10 eqs total, each eq is length 10
     # shape: A = (10,10), b = (10,)
     b = np.concatenate([b_top, b_bot])
 
-    # --- 6) Solve for each of the possible 9 sign-combinations, check feasibility ---
+    # combi is 1..9 in MATLAB, but 0-indexed in Python, so case k is A_top[k-1]
+    k_idxs = np.asarray(combis) - 1
+    A_stack = np.empty((len(combis), 10, 10))
+    A_stack[:, :7, :] = A_top[k_idxs]
+    A_stack[:, 7:, :] = A_bot
+
+    return _PowertrainSystem(
+        config, supplied_power_ratio, shaft_power_ratio, P_inst, throttle_config,
+        zeroIsASolution == 1, k_idxs, A_stack, b,
+    )
+
+
+def _solve_stacked(A_stack, b):
+    """
+    Solve a stack of 10x10 systems, skipping the singular ones.
+
+    Parameters
+    ----------
+    A_stack : np.ndarray
+        System matrices, shape (..., 10, 10).
+    b : np.ndarray
+        Right-hand sides, broadcastable to shape (..., 10).
+
+    Returns
+    -------
+    X : np.ndarray
+        Solutions, shape (..., 10); NaN where the system is singular.
+    solved : np.ndarray of bool
+        Which systems were solved, shape (...).
+    """
+    batch_shape = A_stack.shape[:-2]
+    b = np.broadcast_to(b, batch_shape + (10,))
+    try:
+        # Solve all systems in one stacked LAPACK call
+        X = np.linalg.solve(A_stack, b[..., np.newaxis])[..., 0]
+        solved = np.ones(batch_shape, dtype=bool)
+    except np.linalg.LinAlgError:
+        # At least one system is singular; solve them one by one and skip those
+        X = np.full(batch_shape + (10,), np.nan)
+        solved = np.zeros(batch_shape, dtype=bool)
+        for idx in np.ndindex(*batch_shape):
+            try:
+                X[idx] = np.linalg.solve(A_stack[idx], b[idx])
+                solved[idx] = True
+            except np.linalg.LinAlgError:
+                continue
+
+    return X, solved
+
+
+def _chain_solution(system, etas):
+    """
+    Solve a conventional or turboelectric system in closed form.
+
+    These configs have a single case with one power chain from the fuel to the propulsor,
+    so every power is the fuel power times a product of efficiencies and the one
+    specified operating condition sets the scale.
+
+    Parameters
+    ----------
+    system : _PowertrainSystem
+        The assembled systems of the operating point.
+    etas : dict
+        Component efficiencies.
+
+    Returns
+    -------
+    np.ndarray or None
+        Solution of shape (1, 10), or None if the closed form does not apply and the
+        system must be solved numerically.
+    """
+    if system.config == 'conventional':
+        # f -> gt -> s1 -> p1
+        P_gt = etas['GT']
+        P_s1 = etas['GB'] * P_gt
+        unit = [1.0, P_gt, 0.0, P_s1, 0.0, 0.0, 0.0, 0.0, etas['P1'] * P_s1, 0.0]
+    elif system.config == 'turboelectric':
+        # f -> gt -> gb -> e1 -> e2 -> s2 -> p2
+        P_gt = etas['GT']
+        P_gb = etas['GB'] * P_gt
+        P_e1 = etas['EM1'] * P_gb
+        P_e2 = etas['PM'] * P_e1
+        P_s2 = etas['EM2'] * P_e2
+        unit = [1.0, P_gt, P_gb, 0.0, P_e1, 0.0, P_e2, P_s2, 0.0, etas['P2'] * P_s2]
+    else:
+        return None
+
+    unit = np.array(unit, dtype=float)
+    # The forced phi and Phi rows hold for any scale; only the operating-condition row
+    # has a nonzero coefficient.
+    coeffs = system.A_stack[0, 7:] @ unit
+    k = np.argmax(np.abs(coeffs))
+    if not coeffs[k]:
+        # singular, e.g. a zero efficiency
+        return None
+
+    return (system.b[7 + k] / coeffs[k]) * unit[np.newaxis]
+
+
+def _organize_outputs(system, X, solved):
+    """
+    Pick the feasible sign case of one operating point and build the outputs.
+
+    This covers steps 6 to 8 of power_transmission_computation.
+
+    Parameters
+    ----------
+    system : _PowertrainSystem
+        The assembled systems of the operating point.
+    X : np.ndarray
+        Solution of each candidate case, shape (n_combis, 10).
+    solved : np.ndarray of bool
+        Which candidate cases were solved, shape (n_combis,).
+
+    Returns
+    -------
+    tuple
+        Same as power_transmission_computation.
+    """
+    config = system.config
+    supplied_power_ratio = system.supplied_power_ratio
+    shaft_power_ratio = system.shaft_power_ratio
+    P_inst = system.P_inst
+    throttle_config = system.throttle_config
+    zeroIsASolution = system.zero_is_solution
+    k_idxs = system.k_idxs
+
+    # --- 6) Check the feasibility of each solved sign-combination ---
     P_sol = np.full((9,10), np.nan)  # Each row is a solution for that combi
     solution = np.zeros(9, dtype=int)
 
-    for combi in combis:
-        # combi is 1..9 in MATLAB, but 0‐indexed in Python we do combi-1?
-        # The code above used 'case k' in [1..9]. We'll do k-1 in Python:
-        k_idx = combi - 1
-        A_mat = np.vstack([A_top[:,:,k_idx], A_bot])
-        try:
-            # Solve linear system
-            x_vec = np.linalg.solve(A_mat, b)
-        except np.linalg.LinAlgError:
-            # If singular or ill-conditioned, skip
-            continue
-
-        P_sol[k_idx,:] = x_vec
-
-        # Check feasibility w.r.t. sign assumptions.
-        # Compare to MATLAB cases. We check columns:
-        #   Pgt(1), Ps1(3), Pe1(4), Pbat(5), Pe2(6) with correct sign.
-        # Indices are [1, 3, 4, 5, 6] in 0-based => [1, 3, 4, 5, 6]
-        # For each combi, see original sign logic:
-        pgt = x_vec[1]
-        ps1 = x_vec[3]
-        pe1 = x_vec[4]
-        pbat = x_vec[5]
-        pe2 = x_vec[6]
-
-        # We do it exactly as the original switch/case:
-        if combi == 1:
-            if (pgt >= 0 and ps1 >= 0 and pe1 >= 0 and pbat >= 0 and pe2 >= 0):
-                solution[k_idx] = 1
-        elif combi == 2:
-            if (pgt >= 0 and ps1 >= 0 and pe1 >= 0 and pbat < 0 and pe2 >= 0):
-                solution[k_idx] = 1
-        elif combi == 3:
-            if (pgt >= 0 and ps1 >= 0 and pe1 >= 0 and pbat < 0 and pe2 < 0):
-                solution[k_idx] = 1
-        elif combi == 4:
-            if (pgt >= 0 and ps1 >= 0 and pe1 < 0 and pbat >= 0 and pe2 >= 0):
-                solution[k_idx] = 1
-        elif combi == 5:
-            if (pgt >= 0 and ps1 >= 0 and pe1 < 0 and pbat >= 0 and pe2 < 0):
-                solution[k_idx] = 1
-        elif combi == 6:
-            if (pgt >= 0 and ps1 >= 0 and pe1 < 0 and pbat < 0 and pe2 < 0):
-                solution[k_idx] = 1
-        elif combi == 7:
-            if (pgt >= 0 and ps1 < 0 and pe1 >= 0 and pbat >= 0 and pe2 >= 0):
-                solution[k_idx] = 1
-        elif combi == 8:
-            if (pgt >= 0 and ps1 < 0 and pe1 >= 0 and pbat < 0 and pe2 >= 0):
-                solution[k_idx] = 1
-        elif combi == 9:
-            if (pgt >= 0 and ps1 < 0 and pe1 >= 0 and pbat < 0 and pe2 < 0):
-                solution[k_idx] = 1
+    P_sol[k_idxs[solved]] = X[solved]
+
+    # Check feasibility w.r.t. the sign assumptions of each case (see _SIGN_TABLE).
+    # NaN satisfies neither comparison, so unsolved cases are never feasible.
+    signed = X[:, _SIGN_COLS]
+    sign_ok = np.where(_SIGN_TABLE[k_idxs] > 0, signed >= 0, signed < 0).all(axis=1)
+    solution[k_idxs[solved & sign_ok]] = 1
 
     # --- 7) Final check for multiple solutions or none ---
     n_solutions = np.sum(solution)
@@ -487,101 +648,189 @@ def power_transmission_computation(config, etas, supplied_power_ratio, shaft_pow
 
     if solIdx is None:
         # no solution
-        P_out = {name: np.nan for name in 
-                 ['f','gt','gb','s1','e1','bat','e2','s2','p1','p2','p']}
+        P_out = dict.fromkeys(_PATH_KEYS + ('p',), np.nan)
     elif solIdx == -1:
         # zero solution
-        P_out = {name: 0.0 for name in
-                 ['f','gt','gb','s1','e1','bat','e2','s2','p1','p2']}
-        P_out['p'] = 0.0
+        P_out = dict.fromkeys(_PATH_KEYS + ('p',), 0.0)
     else:
-        # Retrieve the feasible solution
+        # Retrieve the feasible solution and null-out unused components for this config.
+        # The total propulsive power is taken before masking.
         x_vec = P_sol[solIdx, :]
-        P_out = {
-            'f'   : x_vec[0],
-            'gt'  : x_vec[1],
-            'gb'  : x_vec[2],
-            's1'  : x_vec[3],
-            'e1'  : x_vec[4],
-            'bat' : x_vec[5],
-            'e2'  : x_vec[6],
-            's2'  : x_vec[7],
-            'p1'  : x_vec[8],
-            'p2'  : x_vec[9],
-        }
-        P_out['p'] = P_out['p1'] + P_out['p2']
-
-        # Null-out unused components depending on config
-        if config == 'conventional':
-            P_out['gb']  = np.nan
-            P_out['e1']  = np.nan
-            P_out['bat'] = np.nan
-            P_out['e2']  = np.nan
-            P_out['s2']  = np.nan
-            P_out['p2']  = np.nan
-
-        elif config == 'turboelectric':
-            P_out['s1']  = np.nan
-            P_out['p1']  = np.nan
-            P_out['bat'] = np.nan
-
-        elif config == 'serial':
-            P_out['s1']  = np.nan
-            P_out['p1']  = np.nan
-
-        elif config == 'parallel':
-            P_out['s2']  = np.nan
-            P_out['p2']  = np.nan
-            P_out['e2']  = np.nan
-
-        elif config == 'PTE':
-            P_out['bat'] = np.nan
-
-        elif config == 'SPPH':
-            pass  # uses everything
-
-        elif config == 'e-1':
-            P_out['f']   = np.nan
-            P_out['gt']  = np.nan
-            P_out['e2']  = np.nan
-            P_out['s2']  = np.nan
-            P_out['p2']  = np.nan
-
-        elif config == 'e-2':
-            P_out['f']   = np.nan
-            P_out['gt']  = np.nan
-            P_out['gb']  = np.nan
-            P_out['s1']  = np.nan
-            P_out['p1']  = np.nan
-            P_out['e1']  = np.nan
-
-        elif config == 'dual-e':
-            P_out['f']   = np.nan
-            P_out['gt']  = np.nan
+        P_out = dict(zip(_PATH_KEYS, np.where(_UNUSED_MASK[config], np.nan, x_vec)))
+        P_out['p'] = x_vec[8] + x_vec[9]
 
     # Compute the final xi_out, phi_out, Phi_out
-    if not np.isnan(P_inst):
+    if not math.isnan(P_inst):
         if throttle_config == 1:
-            xi_out = (P_out['gt'] / P_inst) if not np.isnan(P_out['gt']) else np.nan
+            xi_out = (P_out['gt'] / P_inst) if not math.isnan(P_out['gt']) else np.nan
         elif throttle_config == 2:
             # e1 is negative in normal usage as generator, so throttle = -P_e1 / P_inst
-            xi_out = (-P_out['e1'] / P_inst) if not np.isnan(P_out['e1']) else np.nan
+            xi_out = (-P_out['e1'] / P_inst) if not math.isnan(P_out['e1']) else np.nan
         else:
-            xi_out = (P_out['e2'] / P_inst) if not np.isnan(P_out['e2']) else np.nan
+            xi_out = (P_out['e2'] / P_inst) if not math.isnan(P_out['e2']) else np.nan
     else:
         xi_out = np.nan
 
-    if np.isnan(supplied_power_ratio):
-        # P_out['bat'] / (P_out['bat'] + P_out['f'])
-        den = (P_out['bat'] + P_out['f'])
-        phi_out = (P_out['bat'] / den) if abs(den) > 1e-12 else np.nan
+    if math.isnan(supplied_power_ratio):
+        phi_out = _safe_ratio(P_out['bat'], P_out['bat'] + P_out['f'])
     else:
         phi_out = supplied_power_ratio
 
-    if np.isnan(shaft_power_ratio):
-        den = (P_out['s2'] + P_out['s1'])
-        Phi_out = (P_out['s2'] / den) if abs(den) > 1e-12 else np.nan
+    if math.isnan(shaft_power_ratio):
+        Phi_out = _safe_ratio(P_out['s2'], P_out['s2'] + P_out['s1'])
     else:
         Phi_out = shaft_power_ratio
 
     return P_out, xi_out, phi_out, Phi_out, solution, throttle_config
+
+
+def power_transmission_computation(config, etas, supplied_power_ratio, shaft_power_ratio, throttle_setting, 
+                                   P_p, P_p1, P_p2, P_inst)-> \
+    tuple[float, float, float, float, float, dict]:
+    """
+    Translated from the MATLAB function 'PowerTransmissionComputationV3'.
+    See the original MATLAB docstring for full details. This function
+    computes the power flow along each power path for various hybrid
+    powertrain configurations.
+
+    Inputs:
+    -------
+    config : str
+        Powertrain layout (e.g. 'conventional', 'turboelectric', 'serial', etc.)
+    etas   : dict
+        Dictionary of component efficiencies with fields:
+        { 'GT', 'GB', 'P1', 'EM1', 'PM', 'EM2', 'P2' } (all in (0,1))
+    supplied_power_ratio    : float or NaN
+        Supplied power ratio [-],  P_bat / (P_bat + P_f)
+    shaft_power_ratio    : float or NaN
+        Shaft power ratio [-],  P_s2 / (P_s2 + P_s1)
+    throttle_setting     : float or NaN
+        Throttle setting [-], see notes in original docstring
+    P_p    : float or NaN
+        Total propulsive power [W]
+    P_p1   : float or NaN
+        Propulsive power from primary propulsor(s) [W]
+    P_p2   : float or NaN
+        Propulsive power from secondary propulsor(s) [W]
+    P_inst : float or NaN
+        Maximum installed power of GT or EM in this flight condition [W]
+
+    Returns:
+    --------
+    P_out     : dict
+        Dictionary with the power flow in each path
+        { 'f','gt','gb','s1','e1','bat','e2','s2','p1','p2','p' }
+    xi_out    : float
+        Actual throttle used in the solution ([-])
+    phi_out   : float
+        Actual supplied power ratio ([-])
+    Phi_out   : float
+        Actual shaft power ratio ([-])
+    solution  : np.ndarray of length 9
+        A binary array indicating which of the 9 power-flow-direction
+        combinations yielded a feasible solution
+    xi_config : int
+        Indicates which component throttle refers to:
+        1 = Gas turbine, 2 = Primary EM, 3 = Secondary EM.
+    """
+
+
+    system = _build_system(
+        config, etas, supplied_power_ratio, shaft_power_ratio, throttle_setting,
+        P_p, P_p1, P_p2, P_inst,
+    )
+    # Solve for each of the candidate sign-combinations
+    X = _chain_solution(system, etas)
+    if X is not None:
+        solved = np.ones(1, dtype=bool)
+    else:
+        X, solved = _solve_stacked(system.A_stack, system.b)
+
+    return _organize_outputs(system, X, solved)
+
+
+def power_transmission_computation_batch(config, etas, supplied_power_ratio, shaft_power_ratio,
+                                         throttle_setting, P_p, P_p1, P_p2, P_inst):
+    """
+    Batched solve of power_transmission_computation over many operating points.
+
+    Each point's system is still assembled, and its outputs organized, in a Python loop
+    as in power_transmission_computation; only the linear solves of all points and
+    candidate sign cases are batched into a single stacked call. This removes the
+    per-point solve overhead for mission-profile sweeps.
+
+    Parameters
+    ----------
+    config : str
+        Powertrain layout, shared by all points.
+    etas : dict
+        Component efficiencies, shared by all points.
+    supplied_power_ratio, shaft_power_ratio, throttle_setting, P_p, P_p1, P_p2, P_inst :
+        float or array_like
+        Operating conditions as in power_transmission_computation. They are broadcast
+        against each other to a 1-D array of N points; NaN marks an unspecified value.
+        N may be zero, in which case all outputs are empty.
+
+    Returns
+    -------
+    P_out : dict
+        Power flow in each path, as in power_transmission_computation, with an array of
+        shape (N,) per key.
+    xi_out : np.ndarray
+        Actual throttle of each point, shape (N,).
+    phi_out : np.ndarray
+        Actual supplied power ratio of each point, shape (N,).
+    Phi_out : np.ndarray
+        Actual shaft power ratio of each point, shape (N,).
+    solution : np.ndarray
+        Feasible power-flow-direction combinations of each point, shape (N, 9).
+    xi_config : np.ndarray
+        Component the throttle refers to at each point, shape (N,).
+    """
+    conditions = np.broadcast_arrays(*(
+        np.atleast_1d(np.asarray(value, dtype=float)).ravel()
+        for value in (supplied_power_ratio, shaft_power_ratio, throttle_setting,
+                      P_p, P_p1, P_p2, P_inst)
+    ))
+
+    if not conditions[0].size:
+        empty = np.empty(0)
+        return (
+            {key: empty.copy() for key in _PATH_KEYS + ('p',)}, empty.copy(), empty.copy(),
+            empty.copy(), np.empty((0, 9), dtype=int), np.empty(0, dtype=int),
+        )
+
+    systems = [
+        _build_system(config, etas, *(float(value) for value in point))
+        for point in zip(*conditions)
+    ]
+    A_stack = np.stack([system.A_stack for system in systems])
+    b = np.stack([system.b for system in systems])[:, np.newaxis, :]
+    X = np.full(A_stack.shape[:-1], np.nan)
+    solved = np.zeros(A_stack.shape[:-2], dtype=bool)
+
+    # Use the closed form where it applies, and solve the remaining points and candidate
+    # sign-combinations at once
+    numeric = []
+    for i, system in enumerate(systems):
+        X_chain = _chain_solution(system, etas)
+        if X_chain is None:
+            numeric.append(i)
+        else:
+            X[i] = X_chain
+            solved[i] = True
+
+    if numeric:
+        X[numeric], solved[numeric] = _solve_stacked(A_stack[numeric], b[numeric])
+
+    results = [
+        _organize_outputs(system, X[i], solved[i]) for i, system in enumerate(systems)
+    ]
+    P_outs, xi_out, phi_out, Phi_out, solution, xi_config = zip(*results)
+
+    P_out = {key: np.array([P[key] for P in P_outs]) for key in _PATH_KEYS + ('p',)}
+
+    return (
+        P_out, np.array(xi_out, dtype=float), np.array(phi_out, dtype=float),
+        np.array(Phi_out, dtype=float), np.array(solution), np.array(xi_config),
+    )
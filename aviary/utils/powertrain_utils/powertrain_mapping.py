@@ -41,30 +41,84 @@ Example
 """
 
 import csv
+import itertools
 import numpy as np
 from datetime import datetime
-from typing import Callable, List, Optional, Union
+from typing import Callable, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Dict
-@dataclass
+from typing import Mapping
+
+# Column header line and per-column formats of the mapping file
+_COLUMN_HEADER = (
+    b"Mach_Number, Altitude (ft), Supplied_Power_Ratio (-), Shaft_Power_Ratio (-),   Throttle, "
+    b"Gross_Thrust (lbf), Ram_Drag (lbf), Fuel_Flow (lb/h), NOx_Rate (lb/h), Electric_Power (kW)\n"
+)
+_ROW_FMT = ('%9.1f', '%11.1f', '%23.6f', '%18.6f', '%8.1f',
+            '%15.1f', '%13.1f', '%13.1f', '%11.4f', '%15.3f')
+
+
+class _FrozenEtas(dict):
+    """
+    Read-only dict of component efficiencies.
+
+    Subclassing dict (rather than wrapping it in a read-only proxy) keeps
+    dataclasses.asdict, copy and pickle working.
+    """
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('PowertrainConfig.etas is read-only')
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        # rebuild through the constructor, since unpickling would otherwise call __setitem__
+        return (_FrozenEtas, (dict(self),))
+
+
+@dataclass(frozen=True)
 class PowertrainConfig:
     """
     Configuration class for powertrain parameters.
+
+    Instances are immutable and hashable, so they can be used as cache keys. The
+    efficiencies are stored as a read-only dict and the hash is computed once.
     
     Attributes
     ----------
     config : str
         Powertrain configuration type ('serial', 'parallel', 'turboelectric', etc.)
-    etas : dict
+    etas : Mapping[str, float]
         Component efficiencies
     P_inst : float
         Installed power in Watts
     """
+    __slots__ = ('config', 'etas', 'P_inst', '_hash')
+
     config: str
-    etas: Dict[str, float]
+    etas: Mapping[str, float]
     P_inst: float
 
+    def __post_init__(self):
+        etas = _FrozenEtas(self.etas)
+        object.__setattr__(self, 'etas', etas)
+        object.__setattr__(
+            self, '_hash', hash((self.config, tuple(sorted(etas.items())), self.P_inst))
+        )
+
+    def __hash__(self):
+        return self._hash
+
+    # frozen slotted instances cannot be restored attribute by attribute when unpickled
+    # (dataclass(slots=True) generates the same hooks on Python >= 3.10)
+    def __getstate__(self):
+        return (self.config, dict(self.etas), self.P_inst)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
 
 class PowertrainMapper:
     """
@@ -90,20 +144,27 @@ class PowertrainMapper:
         throttle_settings: List[float],
         supplied_power_ratios: Optional[List[float]] = None
     ):
-        self.mach_numbers = sorted(mach_numbers)
-        self.altitudes = sorted(altitudes)
-        self.throttle_settings = sorted(throttle_settings)
+        # Grids are stored as sorted, read-only float64 arrays
+        self.mach_numbers = self._sorted_array(mach_numbers)
+        self.altitudes = self._sorted_array(altitudes)
+        self.throttle_settings = self._sorted_array(throttle_settings)
         
         # If supplied_power_ratios not provided, default to [1.0] (single value)
         if supplied_power_ratios is None:
-            self.supplied_power_ratios = [1.0]
-        else:
-            self.supplied_power_ratios = sorted(supplied_power_ratios)
+            supplied_power_ratios = [1.0]
+        self.supplied_power_ratios = self._sorted_array(supplied_power_ratios)
         
         # Calculate total number of data points
-        self.total_points = (len(mach_numbers) * len(altitudes) * 
-                            len(throttle_settings) * len(self.supplied_power_ratios))
+        self.total_points = (len(self.mach_numbers) * len(self.altitudes) *
+                             len(self.throttle_settings) * len(self.supplied_power_ratios))
         
+    @staticmethod
+    def _sorted_array(values: List[float]) -> np.ndarray:
+        """Return the values as a sorted, read-only float64 array."""
+        array = np.sort(np.asarray(values, dtype=np.float64))
+        array.flags.writeable = False
+        return array
+
     def generate_mapping_file(
         self,
         output_file: Union[str, Path],
@@ -114,7 +175,9 @@ class PowertrainMapper:
         electric_power_function: Callable[[float, float, float, float], float],
         shaft_power_ratio_function: Optional[Callable[[float, float, float, float], float]] = None,
         description: str = "Custom powertrain mapping file",
-        author: str = "PowertrainMapper"
+        author: str = "PowertrainMapper",
+        vectorized: bool = False,
+        verbose: bool = False
     ) -> None:
         """
         Generate a powertrain mapping file.
@@ -140,6 +203,14 @@ class PowertrainMapper:
             Description to include in the file header
         author : str
             Author name to include in the file header
+        vectorized : bool
+            If True, each function is called once with flattened ndarrays covering the
+            whole grid (ordered mach, altitude, supplied_power_ratio, throttle) and must
+            return an array of the same length (or a scalar). If False, the functions are
+            called once per grid point with scalar arguments.
+        verbose : bool
+            If True, report progress about every 10% of the grid points when evaluating
+            point by point.
         """
         output_path = Path(output_file)
         
@@ -150,45 +221,128 @@ class PowertrainMapper:
         print(f"Throttle settings: {len(self.throttle_settings)} points")
         print(f"Supplied power ratios: {len(self.supplied_power_ratios)} points")
         
-        with open(output_path, 'w', newline='') as csvfile:
-            # Write header comments
-            csvfile.write(f"# created {datetime.now().strftime('%m/%d/%y')}\n")
-            csvfile.write(f"# {description}\n")
-            csvfile.write(f"# generated by {author} using PowertrainMapper\n")
-            csvfile.write(f"# NOTE: this powertrain is for example/testing purposes only\n")
-            csvfile.write("\n")
-            
-            # Write column headers
-            csvfile.write("Mach_Number, Altitude (ft), Supplied_Power_Ratio (-), Shaft_Power_Ratio (-),   Throttle, Gross_Thrust (lbf), Ram_Drag (lbf), Fuel_Flow (lb/h), NOx_Rate (lb/h), Electric_Power (kW)\n")
-            
-            # Generate data points
-            point_count = 0
-            for mach in self.mach_numbers:
-                for altitude in self.altitudes:
-                    for supplied_power_ratio in self.supplied_power_ratios:
-                        for throttle in self.throttle_settings:
-                            # Calculate performance parameters
-                            thrust = thrust_function(mach, altitude, throttle, supplied_power_ratio)
-                            drag = drag_function(mach, altitude, throttle, supplied_power_ratio)
-                            fuel_flow = fuel_flow_function(mach, altitude, throttle, supplied_power_ratio)
-                            nox_rate = nox_rate_function(mach, altitude, throttle, supplied_power_ratio)
-                            electric_power = electric_power_function(mach, altitude, throttle, supplied_power_ratio)
-                            
-                            # Calculate shaft power ratio (default to 1.0 if not provided)
-                            if shaft_power_ratio_function is not None:
-                                shaft_power_ratio = shaft_power_ratio_function(mach, altitude, throttle, supplied_power_ratio)
-                            else:
-                                shaft_power_ratio = 1.0
-                            
-                            # Write data row
-                            csvfile.write(f"{mach:9.1f}, {altitude:11.1f}, {supplied_power_ratio:23.6f}, {shaft_power_ratio:18.6f}, {throttle:8.1f}, {thrust:15.1f}, {drag:13.1f}, {fuel_flow:13.1f}, {nox_rate:11.4f}, {electric_power:15.3f}\n")
-                            
-                            point_count += 1
-                            if point_count % 100 == 0:
-                                print(f"Generated {point_count}/{self.total_points} data points...")
-        
+        # Header comments
+        header = (
+            f"# created {datetime.now().strftime('%m/%d/%y')}\n"
+            f"# {description}\n"
+            f"# generated by {author} using PowertrainMapper\n"
+            f"# NOTE: this powertrain is for example/testing purposes only\n"
+            "\n"
+        )
+
+        # Binary mode skips the text layer; np.savetxt encodes the rows itself
+        with open(output_path, 'wb', buffering=1 << 20) as csvfile:
+            csvfile.write(header.encode('utf-8'))
+            csvfile.write(_COLUMN_HEADER)
+
+            if vectorized:
+                data = self._evaluate_grid(
+                    thrust_function, drag_function, fuel_flow_function, nox_rate_function,
+                    electric_power_function, shaft_power_ratio_function
+                )
+            else:
+                data = self._evaluate_points(
+                    thrust_function, drag_function, fuel_flow_function, nox_rate_function,
+                    electric_power_function, shaft_power_ratio_function, verbose
+                )
+
+            # Write all data rows in one call; an empty grid leaves a header-only file
+            data = np.asarray(data, dtype=float)
+            if data.size:
+                np.savetxt(csvfile, data, fmt=_ROW_FMT, delimiter=', ')
+            point_count = len(data)
+
         print(f"Successfully generated {output_path} with {point_count} data points")
     
+    def _evaluate_points(
+        self,
+        thrust_function: Callable[[float, float, float, float], float],
+        drag_function: Callable[[float, float, float, float], float],
+        fuel_flow_function: Callable[[float, float, float, float], float],
+        nox_rate_function: Callable[[float, float, float, float], float],
+        electric_power_function: Callable[[float, float, float, float], float],
+        shaft_power_ratio_function: Optional[Callable[[float, float, float, float], float]],
+        verbose: bool = False
+    ) -> List[tuple]:
+        """
+        Evaluate the performance functions one grid point at a time.
+
+        Progress is printed about every 10% of the grid points if verbose is True.
+
+        Returns
+        -------
+        List[tuple]
+            One row per grid point, in output column order
+        """
+        rows = []
+        stride = max(1, self.total_points // 10)
+        # One flat loop in (mach, altitude, supplied_power_ratio, throttle) order; the user
+        # functions are called with plain Python floats
+        for point_count, (mach, altitude, supplied_power_ratio, throttle) in enumerate(
+                self.iter_operating_conditions(), start=1):
+            # Calculate performance parameters
+            thrust = thrust_function(mach, altitude, throttle, supplied_power_ratio)
+            drag = drag_function(mach, altitude, throttle, supplied_power_ratio)
+            fuel_flow = fuel_flow_function(mach, altitude, throttle, supplied_power_ratio)
+            nox_rate = nox_rate_function(mach, altitude, throttle, supplied_power_ratio)
+            electric_power = electric_power_function(mach, altitude, throttle, supplied_power_ratio)
+
+            # Calculate shaft power ratio (default to 1.0 if not provided)
+            if shaft_power_ratio_function is not None:
+                shaft_power_ratio = shaft_power_ratio_function(mach, altitude, throttle, supplied_power_ratio)
+            else:
+                shaft_power_ratio = 1.0
+
+            rows.append((mach, altitude, supplied_power_ratio, shaft_power_ratio, throttle,
+                         thrust, drag, fuel_flow, nox_rate, electric_power))
+
+            if verbose and point_count % stride == 0:
+                print(f"Generated {point_count}/{self.total_points} data points...")
+        return rows
+
+    def _evaluate_grid(
+        self,
+        thrust_function: Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray],
+        drag_function: Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray],
+        fuel_flow_function: Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray],
+        nox_rate_function: Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray],
+        electric_power_function: Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray],
+        shaft_power_ratio_function: Optional[Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray]]
+    ) -> np.ndarray:
+        """
+        Evaluate the performance functions over the whole grid in one call each.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (total_points, 10), one row per grid point, in output column order
+        """
+        mach, altitude, supplied_power_ratio, throttle = self.to_arrays()
+
+        if shaft_power_ratio_function is not None:
+            shaft_power_ratio = shaft_power_ratio_function(mach, altitude, throttle, supplied_power_ratio)
+        else:
+            shaft_power_ratio = 1.0
+
+        columns = [
+            mach,
+            altitude,
+            supplied_power_ratio,
+            shaft_power_ratio,
+            throttle,
+            thrust_function(mach, altitude, throttle, supplied_power_ratio),
+            drag_function(mach, altitude, throttle, supplied_power_ratio),
+            fuel_flow_function(mach, altitude, throttle, supplied_power_ratio),
+            nox_rate_function(mach, altitude, throttle, supplied_power_ratio),
+            electric_power_function(mach, altitude, throttle, supplied_power_ratio),
+        ]
+        # Row-major buffer, since np.savetxt writes the file row by row; scalar returns
+        # (e.g. a constant shaft power ratio) are broadcast to the grid
+        data = np.empty((mach.size, len(columns)))
+        for j, col in enumerate(columns):
+            data[:, j] = col
+        return data
+
     def get_operating_conditions(self) -> List[tuple]:
         """
         Get all combinations of operating conditions.
@@ -198,31 +352,60 @@ class PowertrainMapper:
         List[tuple]
             List of (mach, altitude, supplied_power_ratio, throttle) tuples
         """
-        conditions = []
-        for mach in self.mach_numbers:
-            for altitude in self.altitudes:
-                for supplied_power_ratio in self.supplied_power_ratios:
-                    for throttle in self.throttle_settings:
-                        conditions.append((mach, altitude, supplied_power_ratio, throttle))
-        return conditions
+        return list(self.iter_operating_conditions())
+
+    def iter_operating_conditions(self) -> Iterator[tuple]:
+        """
+        Iterate over all combinations of operating conditions without building a list.
+
+        Returns
+        -------
+        Iterator[tuple]
+            (mach, altitude, supplied_power_ratio, throttle) tuples of Python floats, in
+            output file order
+        """
+        return itertools.product(
+            self.mach_numbers.tolist(), self.altitudes.tolist(),
+            self.supplied_power_ratios.tolist(), self.throttle_settings.tolist()
+        )
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get all combinations of operating conditions as flat arrays.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+            Mach, altitude, supplied power ratio and throttle arrays of length
+            total_points, in output file order
+        """
+        return tuple(
+            grid.ravel() for grid in np.meshgrid(
+                self.mach_numbers, self.altitudes, self.supplied_power_ratios,
+                self.throttle_settings, indexing='ij'
+            )
+        )
     
     def print_summary(self) -> None:
         """Print a summary of the mapping configuration."""
         print("Powertrain Mapping Configuration:")
-        print(f"  Mach numbers: {self.mach_numbers}")
-        print(f"  Altitudes (ft): {self.altitudes}")
-        print(f"  Supplied power ratios: {self.supplied_power_ratios}")
-        print(f"  Throttle settings: {self.throttle_settings}")
+        print(f"  Mach numbers: {self.mach_numbers.tolist()}")
+        print(f"  Altitudes (ft): {self.altitudes.tolist()}")
+        print(f"  Supplied power ratios: {self.supplied_power_ratios.tolist()}")
+        print(f"  Throttle settings: {self.throttle_settings.tolist()}")
         print(f"  Total data points: {self.total_points}")
 
 
 # Example functions for testing
 def dummy_thrust_function(mach: float, altitude_ft: float, throttle: float, supplied_power_ratio: float) -> float:
     """Dummy thrust function for testing."""
-    base_thrust = 1000.0 + throttle * 500.0
-    mach_factor = 1.0 - 0.1 * mach
-    altitude_factor = 1.0 - altitude_ft / 100000.0
-    return base_thrust * mach_factor * altitude_factor
+    # Augmented assignment updates the result in place for array inputs, so the factors
+    # do not allocate a temporary per product; scalars are unaffected.
+    thrust = throttle * 500.0
+    thrust += 1000.0
+    thrust *= 1.0 - 0.1 * mach
+    thrust *= 1.0 - altitude_ft / 100000.0
+    return thrust
 
 
 def dummy_drag_function(mach: float, altitude_ft: float, throttle: float, supplied_power_ratio: float) -> float:
@@ -232,12 +415,13 @@ def dummy_drag_function(mach: float, altitude_ft: float, throttle: float, suppli
 
 def dummy_fuel_flow_function(mach: float, altitude_ft: float, throttle: float, supplied_power_ratio: float) -> float:
     """Dummy fuel flow function for testing."""
-    base_flow = 100.0 + throttle * 50.0
-    mach_factor = 1.0 + 0.2 * mach
-    altitude_factor = 1.0 + altitude_ft / 50000.0
+    fuel_flow = throttle * 50.0
+    fuel_flow += 100.0
+    fuel_flow *= 1.0 + 0.2 * mach
+    fuel_flow *= 1.0 + altitude_ft / 50000.0
     # Fuel flow decreases with higher supplied_power_ratio (more electric power)
-    fuel_factor = 1.0 - supplied_power_ratio * 0.5
-    return base_flow * mach_factor * altitude_factor * fuel_factor
+    fuel_flow *= 1.0 - supplied_power_ratio * 0.5
+    return fuel_flow
 
 
 def dummy_nox_rate_function(mach: float, altitude_ft: float, throttle: float, supplied_power_ratio: float) -> float:
@@ -247,12 +431,13 @@ def dummy_nox_rate_function(mach: float, altitude_ft: float, throttle: float, su
 
 def dummy_electric_power_function(mach: float, altitude_ft: float, throttle: float, supplied_power_ratio: float) -> float:
     """Dummy electric power function for testing."""
-    base_power = 10.0 + throttle * 5.0
-    mach_factor = 1.0 + 0.1 * mach
-    altitude_factor = 1.0 - altitude_ft / 200000.0
+    electric_power = throttle * 5.0
+    electric_power += 10.0
+    electric_power *= 1.0 + 0.1 * mach
+    electric_power *= 1.0 - altitude_ft / 200000.0
     # Electric power increases with supplied_power_ratio
-    electric_factor = 0.5 + supplied_power_ratio * 0.5
-    return base_power * mach_factor * altitude_factor * electric_factor
+    electric_power *= 0.5 + supplied_power_ratio * 0.5
+    return electric_power
 
 
 def generate_dummy_powertrain_file():
@@ -281,7 +466,8 @@ def generate_dummy_powertrain_file():
         nox_rate_function=dummy_nox_rate_function,
         electric_power_function=dummy_electric_power_function,
         description="Dummy powertrain mapping file for testing PowertrainMapper",
-        author="PowertrainMapper Test"
+        author="PowertrainMapper Test",
+        vectorized=True
     )
 
 
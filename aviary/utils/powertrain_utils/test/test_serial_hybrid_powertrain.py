@@ -6,39 +6,53 @@ This script validates the power_transmission_computation function and the
 PowertrainMapper framework with various operating conditions.
 """
 
+import dataclasses
+import pickle
+import tempfile
+from pathlib import Path
+from types import MappingProxyType
+
 import numpy as np
-from dataclasses import dataclass
-from typing import Dict
-from aviary.utils.powertrain_utils.component_matices import power_transmission_computation
+from aviary.utils.powertrain_utils.component_matices import (
+    power_transmission_computation,
+    power_transmission_computation_batch,
+)
+from aviary.utils.powertrain_utils.powertrain_mapping import (
+    PowertrainConfig,
+    PowertrainMapper,
+    dummy_drag_function,
+    dummy_electric_power_function,
+    dummy_fuel_flow_function,
+    dummy_nox_rate_function,
+    dummy_thrust_function,
+)
+
+# Component efficiencies and installed power shared by all tests (read-only)
+_ETAS = MappingProxyType({
+    'GT': 0.90,
+    'GB': 0.90,
+    'P1': 0.90,
+    'EM1': 0.90,
+    'PM': 0.90,
+    'EM2': 0.90,
+    'P2': 0.90
+})
+_P_INST = 1.65e6  # 1.65 MW
 
 
-@dataclass
-class PowertrainConfig:
-    """Configuration class for powertrain parameters."""
-    config: str
-    etas: Dict[str, float]
-    P_inst: float
+def isa_speed_of_sound(altitude_m):
+    """Return the ISA speed of sound (m/s) at the given altitude(s) in meters."""
+    T = np.where(altitude_m <= 11000, 288.15 - 0.0065 * altitude_m, 216.65)
+    return np.sqrt(1.4 * 287.05 * T)
 
 
 def test_power_transmission_computation():
     """Test the power_transmission_computation function with various inputs."""
-    
-    print("\n" + "="*80)
-    print("Testing power_transmission_computation Function")
-    print("="*80 + "\n")
-    
+
     # Configuration for serial hybrid
     config = 'serial'
-    etas = {
-        'GT': 0.90,
-        'GB': 0.90,
-        'P1': 0.90,
-        'EM1': 0.90,
-        'PM': 0.90,
-        'EM2': 0.90,
-        'P2': 0.90
-    }
-    P_inst = 1.65e6  # 1.65 MW
+    etas = _ETAS
+    P_inst = _P_INST
     
     # Test cases: (supplied_power_ratio, throttle_setting, description)
     test_cases = [
@@ -52,74 +66,125 @@ def test_power_transmission_computation():
         (0.75, 0.75, "75% battery, 75% throttle"),
     ]
     
-    passed = 0
-    failed = 0
-    
-    for supplied_power_ratio, throttle_setting, description in test_cases:
-        print(f"\nTest case: {description}")
-        print(f"  Supplied power ratio: {supplied_power_ratio}")
-        print(f"  Throttle setting: {throttle_setting}")
-        
-        try:
-            P_out, xi_out, phi_out, Phi_out, solution, throttle_config = power_transmission_computation(
-                config=config,
-                etas=etas,
-                supplied_power_ratio=supplied_power_ratio,
-                shaft_power_ratio=np.nan,
-                throttle_setting=throttle_setting,
-                P_p=np.nan,
-                P_p1=np.nan,
-                P_p2=np.nan,
-                P_inst=P_inst
-            )
-            
-            print(f"  Results:")
-            print(f"    Fuel power (f):      {P_out['f']/1000:.2f} kW")
-            print(f"    GT power (gt):       {P_out['gt']/1000:.2f} kW")
-            print(f"    Battery power (bat): {P_out['bat']/1000:.2f} kW")
-            print(f"    Propulsive power (p):{P_out['p']/1000:.2f} kW")
-            print(f"    Actual supplied power ratio (phi): {phi_out:.3f}")
-            print(f"    Actual shaft power ratio (Phi):    {Phi_out:.3f}")
-            
-            # Validate results
-            if P_out['p'] > 0:
-                print(f"  Status: ✓ PASS")
-                passed += 1
-            else:
-                print(f"  Status: ✗ FAIL (zero propulsive power)")
-                failed += 1
-                
-        except Exception as e:
-            print(f"  Status: ✗ FAIL")
-            print(f"  Error: {str(e)}")
-            failed += 1
-    
-    print(f"\n" + "="*80)
-    print(f"Test Summary: {passed} passed, {failed} failed out of {passed + failed} tests")
-    print("="*80 + "\n")
+    # Evaluate all test cases in one batched call
+    P_outs, xi_outs, phi_outs, Phi_outs, solutions, throttle_configs = \
+        power_transmission_computation_batch(
+            config=config,
+            etas=etas,
+            supplied_power_ratio=np.array([case[0] for case in test_cases]),
+            shaft_power_ratio=np.nan,
+            throttle_setting=np.array([case[1] for case in test_cases]),
+            P_p=np.nan,
+            P_p1=np.nan,
+            P_p2=np.nan,
+            P_inst=P_inst
+        )
     
-    return passed, failed
+    for i, (supplied_power_ratio, throttle_setting, description) in enumerate(test_cases):
+        assert P_outs['p'][i] > 0, f"case {description}: zero propulsive power"
+        np.testing.assert_allclose(phi_outs[i], supplied_power_ratio, rtol=1e-12)
+
+
+def test_power_transmission_computation_batch():
+    """Test that the batched computation matches the point-by-point computation."""
+
+    config = 'serial'
+    etas = _ETAS
+    P_inst = _P_INST
+
+    supplied_power_ratios = np.array([0.0, 0.25, 0.5, 0.75, 1.0, 0.5])
+    throttle_settings = np.array([0.5, 0.75, 0.5, 0.75, 1.0, 0.0])
+
+    P_out, xi_out, phi_out, Phi_out, solution, throttle_config = \
+        power_transmission_computation_batch(
+            config=config,
+            etas=etas,
+            supplied_power_ratio=supplied_power_ratios,
+            shaft_power_ratio=np.nan,
+            throttle_setting=throttle_settings,
+            P_p=np.nan,
+            P_p1=np.nan,
+            P_p2=np.nan,
+            P_inst=P_inst
+        )
+
+    for i, (supplied_power_ratio, throttle_setting) in enumerate(
+            zip(supplied_power_ratios, throttle_settings)):
+        expected = power_transmission_computation(
+            config=config,
+            etas=etas,
+            supplied_power_ratio=supplied_power_ratio,
+            shaft_power_ratio=np.nan,
+            throttle_setting=throttle_setting,
+            P_p=np.nan,
+            P_p1=np.nan,
+            P_p2=np.nan,
+            P_inst=P_inst
+        )
+
+        for key, value in expected[0].items():
+            np.testing.assert_allclose(P_out[key][i], value, rtol=1e-12)
+        np.testing.assert_allclose(
+            [xi_out[i], phi_out[i], Phi_out[i]], expected[1:4], rtol=1e-12
+        )
+        np.testing.assert_array_equal(solution[i], expected[4])
+        assert throttle_config[i] == expected[5]
+
+
+def test_power_transmission_computation_batch_empty():
+    """Test that the batched computation returns empty outputs for zero points."""
+
+    P_out, xi_out, phi_out, Phi_out, solution, throttle_config = \
+        power_transmission_computation_batch(
+            config='serial',
+            etas=_ETAS,
+            supplied_power_ratio=np.array([]),
+            shaft_power_ratio=np.nan,
+            throttle_setting=np.array([]),
+            P_p=np.nan,
+            P_p1=np.nan,
+            P_p2=np.nan,
+            P_inst=_P_INST
+        )
+
+    for value in P_out.values():
+        assert value.shape == (0,)
+    for value in (xi_out, phi_out, Phi_out, throttle_config):
+        assert value.shape == (0,)
+    assert solution.shape == (0, 9)
+
+
+def test_conventional_throttle():
+    """Test that a conventional powertrain at part throttle has a feasible solution."""
+
+    etas = _ETAS
+    P_inst = _P_INST
+
+    P_out, xi_out, phi_out, Phi_out, solution, throttle_config = power_transmission_computation(
+        config='conventional',
+        etas=etas,
+        supplied_power_ratio=np.nan,
+        shaft_power_ratio=np.nan,
+        throttle_setting=0.5,
+        P_p=np.nan,
+        P_p1=np.nan,
+        P_p2=np.nan,
+        P_inst=P_inst
+    )
+
+    assert solution[0] == 1
+    np.testing.assert_allclose(P_out['gt'], 0.5 * P_inst, rtol=1e-12)
+    np.testing.assert_allclose(P_out['p'], 0.5 * P_inst * 0.9 ** 2, rtol=1e-12)
+    np.testing.assert_allclose(P_out['f'], 0.5 * P_inst / 0.9, rtol=1e-12)
 
 
 def test_thrust_calculation():
     """Test thrust calculation from propulsive power."""
-    
-    print("\n" + "="*80)
-    print("Testing Thrust Calculation")
-    print("="*80 + "\n")
-    
+
     # Configuration
     config = 'serial'
-    etas = {
-        'GT': 0.90,
-        'GB': 0.90,
-        'P1': 0.90,
-        'EM1': 0.90,
-        'PM': 0.90,
-        'EM2': 0.90,
-        'P2': 0.90
-    }
-    P_inst = 1.65e6
+    etas = _ETAS
+    P_inst = _P_INST
     
     # Test different flight conditions
     test_cases = [
@@ -128,77 +193,45 @@ def test_thrust_calculation():
         (0.8, 37000.0, 0.5, 1.0, "High speed, high altitude"),
     ]
     
-    for mach, altitude_ft, supplied_power_ratio, throttle_setting, description in test_cases:
-        print(f"\nTest case: {description}")
-        print(f"  Mach: {mach}, Altitude: {altitude_ft} ft")
-        print(f"  Supplied power ratio: {supplied_power_ratio}, Throttle: {throttle_setting}")
-        
-        try:
-            # Get power output
-            P_out, xi_out, phi_out, Phi_out, solution, throttle_config = power_transmission_computation(
-                config=config,
-                etas=etas,
-                supplied_power_ratio=supplied_power_ratio,
-                shaft_power_ratio=np.nan,
-                throttle_setting=throttle_setting,
-                P_p=np.nan,
-                P_p1=np.nan,
-                P_p2=np.nan,
-                P_inst=P_inst
-            )
-            
-            # Calculate flight speed
-            altitude_m = altitude_ft * 0.3048
-            if altitude_m <= 11000:
-                T = 288.15 - 0.0065 * altitude_m
-            else:
-                T = 216.65
-            speed_of_sound = np.sqrt(1.4 * 287.05 * T)
-            flight_speed_ms = max(mach * speed_of_sound, 50.0)  # Minimum 50 m/s
-            
-            # Calculate thrust
-            thrust_N = P_out['p'] / flight_speed_ms
-            thrust_lbf = thrust_N * 0.224809
-            
-            print(f"  Results:")
-            print(f"    Flight speed: {flight_speed_ms:.2f} m/s")
-            print(f"    Propulsive power: {P_out['p']/1000:.2f} kW")
-            print(f"    Thrust: {thrust_lbf:.2f} lbf")
-            print(f"  Status: ✓ PASS")
-            
-        except Exception as e:
-            print(f"  Status: ✗ FAIL")
-            print(f"  Error: {str(e)}")
-    
-    print(f"\n" + "="*80)
+    # Speed of sound at all test altitudes at once
+    altitudes_m = np.array([case[1] for case in test_cases]) * 0.3048
+    speeds_of_sound = isa_speed_of_sound(altitudes_m)
+
+    for (mach, altitude_ft, supplied_power_ratio, throttle_setting, description), speed_of_sound \
+            in zip(test_cases, speeds_of_sound):
+        # Get power output
+        P_out, xi_out, phi_out, Phi_out, solution, throttle_config = power_transmission_computation(
+            config=config,
+            etas=etas,
+            supplied_power_ratio=supplied_power_ratio,
+            shaft_power_ratio=np.nan,
+            throttle_setting=throttle_setting,
+            P_p=np.nan,
+            P_p1=np.nan,
+            P_p2=np.nan,
+            P_inst=P_inst
+        )
+
+        # Calculate flight speed
+        flight_speed_ms = max(mach * speed_of_sound, 50.0)  # Minimum 50 m/s
+
+        # Calculate thrust
+        thrust_N = P_out['p'] / flight_speed_ms
+        thrust_lbf = thrust_N * 0.224809
+
+        assert thrust_lbf > 0, f"case {description}: no thrust"
 
 
 def test_energy_balance():
     """Test energy balance: input power = output power (with efficiencies)."""
-    
-    print("\n" + "="*80)
-    print("Testing Energy Balance")
-    print("="*80 + "\n")
-    
+
     config = 'serial'
-    etas = {
-        'GT': 0.90,
-        'GB': 0.90,
-        'P1': 0.90,
-        'EM1': 0.90,
-        'PM': 0.90,
-        'EM2': 0.90,
-        'P2': 0.90
-    }
-    P_inst = 1.65e6
+    etas = _ETAS
+    P_inst = _P_INST
     
     supplied_power_ratio = 0.5
     throttle_setting = 0.75
     
-    print(f"Test case: Energy balance check")
-    print(f"  Supplied power ratio: {supplied_power_ratio}")
-    print(f"  Throttle setting: {throttle_setting}")
-    
     P_out, xi_out, phi_out, Phi_out, solution, throttle_config = power_transmission_computation(
         config=config,
         etas=etas,
@@ -211,43 +244,69 @@ def test_energy_balance():
         P_inst=P_inst
     )
     
-    print(f"\n  Power flow:")
-    print(f"    Fuel power in:        {P_out['f']/1000:.2f} kW")
-    print(f"    Battery power in:     {P_out['bat']/1000:.2f} kW")
-    print(f"    Total input power:    {(P_out['f'] + P_out['bat'])/1000:.2f} kW")
-    print(f"    Propulsive power out: {P_out['p']/1000:.2f} kW")
-    
-    # Calculate expected efficiency
-    # Serial: fuel -> GT -> EM1 -> PM -> EM2 -> P2
-    overall_efficiency = etas['GT'] * etas['EM1'] * etas['PM'] * etas['EM2'] * etas['P2']
-    print(f"\n  Overall efficiency: {overall_efficiency:.4f}")
-    print(f"  Expected output: {(P_out['f'] + P_out['bat']) * overall_efficiency / 1000:.2f} kW")
-    print(f"  Actual output: {P_out['p']/1000:.2f} kW")
-    
-    # Check if energy is conserved (within tolerance)
-    expected_output = (P_out['f'] + P_out['bat']) * overall_efficiency
-    error = abs(P_out['p'] - expected_output) / expected_output * 100
-    print(f"  Error: {error:.2f}%")
-    
-    if error < 1.0:  # Less than 1% error
-        print(f"  Status: ✓ PASS")
+    # Serial: fuel -> GT -> GB -> EM1 -> PM -> EM2 -> P2; the battery joins at the PM
+    fuel_efficiency = etas['GT'] * etas['GB'] * etas['EM1']
+    electric_efficiency = etas['PM'] * etas['EM2'] * etas['P2']
+    expected_output = (P_out['f'] * fuel_efficiency + P_out['bat']) * electric_efficiency
+
+    np.testing.assert_allclose(P_out['p'], expected_output, rtol=1e-10)
+
+
+def test_empty_mapping_file():
+    """Test that an empty operating grid produces a header-only mapping file."""
+
+    mapper = PowertrainMapper(mach_numbers=[], altitudes=[0.0], throttle_settings=[50.0])
+
+    for vectorized in (False, True):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output_file = Path(tmpdir) / 'empty_powertrain.csv'
+            mapper.generate_mapping_file(
+                output_file=output_file,
+                thrust_function=dummy_thrust_function,
+                drag_function=dummy_drag_function,
+                fuel_flow_function=dummy_fuel_flow_function,
+                nox_rate_function=dummy_nox_rate_function,
+                electric_power_function=dummy_electric_power_function,
+                vectorized=vectorized
+            )
+
+            lines = output_file.read_text().splitlines()
+
+        # only the comment block, the blank line and the column header are written
+        assert all(line.startswith('#') for line in lines[:4])
+        assert lines[4] == ''
+        assert lines[5].startswith('Mach_Number')
+        assert len(lines) == 6
+
+
+def test_powertrain_config():
+    """Test that PowertrainConfig is hashable, read-only, and converts and pickles."""
+
+    config = PowertrainConfig(config='serial', etas=_ETAS, P_inst=_P_INST)
+
+    assert dataclasses.asdict(config) == {
+        'config': 'serial', 'etas': dict(_ETAS), 'P_inst': _P_INST
+    }
+
+    restored = pickle.loads(pickle.dumps(config))
+    assert restored == config
+    assert hash(restored) == hash(config)
+
+    try:
+        config.etas['GT'] = 1.0
+    except TypeError:
+        pass
     else:
-        print(f"  Status: ✗ FAIL (energy balance error > 1%)")
-    
-    print(f"\n" + "="*80)
+        raise AssertionError("PowertrainConfig.etas should be read-only")
 
 
 if __name__ == "__main__":
-    print("\n" + "="*80)
-    print("SERIAL HYBRID POWERTRAIN TEST SUITE")
-    print("="*80)
-    
     # Run all tests
-    passed, failed = test_power_transmission_computation()
+    test_power_transmission_computation()
+    test_power_transmission_computation_batch()
+    test_power_transmission_computation_batch_empty()
+    test_conventional_throttle()
     test_thrust_calculation()
     test_energy_balance()
-    
-    print("\n" + "="*80)
-    print("ALL TESTS COMPLETED")
-    print("="*80 + "\n")
-
+    test_empty_mapping_file()
+    test_powertrain_config()
@@ -12,15 +12,18 @@ class TestSubsystemsMission(unittest.TestCase):
     """Test the setup and run optimization model with a bettery subsystem."""
 
     def setUp(self):
+        # a single builder instance is shared by pre-mission and every mission phase
+        battery_builder = BatteryBuilder()
+
         self.phase_info = {
             'pre_mission': {
                 'include_takeoff': False,
-                'external_subsystems': [BatteryBuilder()],
+                'external_subsystems': [battery_builder],
                 'optimize_mass': True,
             },
             'cruise1': {
                 'subsystem_options': {'core_aerodynamics': {'method': 'computed'}},
-                'external_subsystems': [BatteryBuilder()],
+                'external_subsystems': [battery_builder],
                 'user_options': {
                     'num_segments': 5,
                     'order': 3,
@@ -40,7 +43,7 @@ class TestSubsystemsMission(unittest.TestCase):
             },
             'cruise2': {
                 'subsystem_options': {'core_aerodynamics': {'method': 'computed'}},
-                'external_subsystems': [BatteryBuilder()],
+                'external_subsystems': [battery_builder],
                 'user_options': {
                     'num_segments': 5,
                     'order': 3,